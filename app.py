@@ -2,26 +2,54 @@
 Interview Coach AI — app.py
 Warm, editorial UI. Playfair Display + DM Sans. Teal & amber on cream.
 """
-import streamlit as st, sys
+import streamlit as st, sys, importlib, io, re, hashlib, json, os, secrets, time, copy
+from collections import OrderedDict
 from pathlib import Path
+from types import MappingProxyType
 
 # ── Path setup — must happen before src imports ───────────────────
 _ROOT = Path(__file__).parent
 sys.path.insert(0, str(_ROOT))
 
 # ── Core imports — fail loudly here rather than mid-page ─────────
+# Only the provider catalogue loads eagerly; the LLM core and file parser
+# are resolved on first call so the first paint doesn't wait on them.
 try:
-    from src.core.llm import (
-        PROVIDER_MODELS, HELP_LINKS, verify_connection, call_llm,
-        get_ollama_models, build_session_plan, build_field_plan,
-        grade_answer, coach_followup, get_question_tip,
-        build_session_report, free_chat, transcribe_audio,
-    )
-    from src.utils.file_parser import extract_text, clean
+    from src.core.providers import PROVIDER_MODELS, HELP_LINKS
+    from src.ui.components import (rpt_bar_html, progress_html, score_bar_html,
+                                   q_card_html, grade_ring_html, tip_html, preview_html,
+                                   status_grid_html, report_txt,
+                                   coach_bubble_html, user_bubble_html,
+                                   hero_html, action_plan_html, MODEL_ANSWER_TMPL)
 except ImportError as _e:
     st.error(f"Import error: {_e}. Check that src/ folder is committed to your repo.")
     st.stop()
 
+_LAZY_NAMES = {
+    "src.core.llm": (
+        "verify_connection", "call_llm", "get_ollama_models",
+        "build_session_plan", "build_field_plan", "grade_answer",
+        "coach_followup", "get_question_tip", "build_session_report",
+        "free_chat", "transcribe_in_background", "keep_ollama_warm", "partial_json",
+    ),
+    "src.utils.file_parser": ("extract_text", "clean"),
+}
+
+
+def _lazy(module: str, name: str):
+    """Stand-in that imports `module` on first call, then rebinds `name` to the real function."""
+    def _resolve(*args, **kwargs):
+        fn = getattr(importlib.import_module(module), name)
+        globals()[name] = fn
+        return fn(*args, **kwargs)
+    _resolve.__name__ = name
+    return _resolve
+
+
+for _mod, _names in _LAZY_NAMES.items():
+    for _name in _names:
+        globals()[_name] = _lazy(_mod, _name)
+
 st.set_page_config(
     page_title="Coach Alex — Interview Coach AI",
     page_icon="🎙️",
@@ -30,17 +58,20 @@ st.set_page_config(
 )
 
 # ── Initialise session state ──────────────────────────────────────
-DEFAULTS = {
+DEFAULTS = MappingProxyType({
     "provider": "groq",
     "api_key": "",
     "model": "llama-3.3-70b-versatile",
     "connected": False,
     "resume_text": "",
     "jd_text": "",
+    "resume_hash": "",        # fingerprints of the two texts ("" when blank), used as cache keys
+    "jd_hash": "",
     "page": "home",           # home | setup | session | report | chat
     "session_plan": None,
     "current_q_idx": 0,
-    "session_data": [],       # list of {question, category, answer, grade}
+    "session_data": [],       # list of {question, category, answer, grade, _q55, _a400}
+    "qa_scores": [],          # score column parallel to session_data, for averages
     "grading": False,
     "last_grade": None,
     "show_tip": False,
@@ -54,320 +85,99 @@ DEFAULTS = {
     "setup_mode_radio": None,
     "voice_transcript": "",    # last voice→text result
     "voice_recording_b64": "", # raw b64 audio waiting to transcribe
-}
-for k, v in DEFAULTS.items():
-    if k not in st.session_state: st.session_state[k] = v
-
-# ── CSS ───────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Playfair+Display:ital,wght@0,400;0,700;0,800;1,400&family=DM+Sans:wght@300;400;500;600&display=swap');
-
-:root {
-  --cream:   #faf7f2;
-  --paper:   #f4efe6;
-  --teal:    #0d7377;
-  --teal-lt: #14a8ad;
-  --amber:   #d4813a;
-  --amber-lt:#f0a96e;
-  --ink:     #1a1a2e;
-  --ink-mid: #3d3d5c;
-  --ink-lt:  #7a7a96;
-  --white:   #ffffff;
-  --green:   #2d7a4f;
-  --red:     #c0392b;
-  --shadow:  0 2px 20px rgba(13,115,119,0.10);
-}
-
-html, body, [class*="css"] {
-  font-family: 'DM Sans', sans-serif;
-  background: var(--cream) !important;
-}
-
-/* Hide Streamlit chrome */
-footer { visibility: hidden; }
-#MainMenu { visibility: hidden; }
-/* Deploy button lives in stToolbar — kept visible for Streamlit Cloud */
-
-/* ── Sidebar ──────────────────────────────────────────────────── */
-[data-testid="stSidebar"] {
-  background: var(--ink) !important;
-  border-right: 3px solid var(--teal);
-}
-[data-testid="stSidebar"] * { color: #e8e8f0 !important; }
-[data-testid="stSidebar"] [data-baseweb="select"] > div {
-  background: #2a2a42 !important; border-color: var(--teal) !important;
-}
-[data-testid="stSidebar"] [data-baseweb="select"] span,
-[data-testid="stSidebar"] [data-baseweb="select"] div { color: #e8e8f0 !important; }
-[data-baseweb="popover"], [data-baseweb="menu"] { background: var(--white) !important; }
-[data-baseweb="popover"] [role="option"],
-[data-baseweb="menu"] [role="option"] { background: var(--white) !important; color: var(--ink) !important; }
-[data-baseweb="popover"] [role="option"]:hover,
-[data-baseweb="menu"] [role="option"]:hover { background: #e0f5f5 !important; color: var(--teal) !important; }
-[data-baseweb="popover"] [aria-selected="true"] { background: var(--teal) !important; color: white !important; }
-[data-testid="stSidebar"] input {
-  background: #2a2a42 !important; color: #e8e8f0 !important; border-color: var(--teal) !important;
-}
-[data-testid="stSidebar"] input::placeholder { color: #7a7a96 !important; }
-
-/* ── Main layout ──────────────────────────────────────────────── */
-.main .block-container { padding: 2rem 2.5rem; max-width: 1100px; }
-
-/* ── Typography ───────────────────────────────────────────────── */
-.coach-name {
-  font-family: 'Playfair Display', serif;
-  font-size: 2.6rem; font-weight: 800;
-  color: var(--teal); letter-spacing: -1px;
-}
-.coach-tagline {
-  font-family: 'DM Sans', sans-serif;
-  font-size: 1rem; color: var(--ink-lt); margin-top: -4px;
-  letter-spacing: 0.04em; text-transform: uppercase;
-}
-.section-head {
-  font-family: 'Playfair Display', serif;
-  font-size: 1.6rem; font-weight: 700; color: var(--ink);
-  margin-bottom: 4px;
-}
-.section-sub {
-  font-size: 0.9rem; color: var(--ink-lt); margin-bottom: 1.4rem;
-}
-
-/* ── Cards ────────────────────────────────────────────────────── */
-.card {
-  background: var(--white);
-  border-radius: 16px;
-  padding: 1.6rem 1.8rem;
-  box-shadow: var(--shadow);
-  border: 1px solid rgba(13,115,119,0.1);
-  margin-bottom: 1.2rem;
-}
-.card-teal {
-  background: linear-gradient(135deg, #0d7377 0%, #14a8ad 100%);
-  border-radius: 16px; padding: 1.6rem 1.8rem; color: white;
-  margin-bottom: 1.2rem;
-}
-.card-amber {
-  background: linear-gradient(135deg, #d4813a 0%, #f0a96e 100%);
-  border-radius: 16px; padding: 1.6rem 1.8rem; color: white;
-  margin-bottom: 1.2rem;
-}
-.card-cream {
-  background: var(--paper);
-  border-radius: 16px; padding: 1.4rem 1.6rem;
-  border: 1px solid rgba(212,129,58,0.2); margin-bottom: 1rem;
-}
-
-/* ── Chat bubbles ─────────────────────────────────────────────── */
-.bubble-coach {
-  background: var(--white);
-  border-left: 4px solid var(--teal);
-  border-radius: 0 14px 14px 14px;
-  padding: 14px 18px; margin-bottom: 12px;
-  box-shadow: var(--shadow);
-  font-size: 0.95rem; color: var(--ink); line-height: 1.7;
-}
-.bubble-user {
-  background: linear-gradient(135deg, #0d7377, #14a8ad);
-  border-radius: 14px 0 14px 14px;
-  padding: 14px 18px; margin-bottom: 12px;
-  color: white; font-size: 0.95rem; line-height: 1.6;
-}
-.bubble-label {
-  font-size: 0.72rem; font-weight: 600; letter-spacing: 0.08em;
-  text-transform: uppercase; margin-bottom: 5px;
-}
-.label-coach { color: var(--teal); }
-.label-user  { color: rgba(255,255,255,0.7); text-align: right; }
-
-/* ── Question card ────────────────────────────────────────────── */
-.q-card {
-  background: var(--white);
-  border: 2px solid var(--teal);
-  border-radius: 16px; padding: 1.8rem;
-  margin-bottom: 1.2rem;
-  position: relative;
-}
-.q-number {
-  font-family: 'Playfair Display', serif;
-  font-size: 3rem; font-weight: 800;
-  color: rgba(13,115,119,0.12);
-  position: absolute; top: 12px; right: 18px; line-height: 1;
-}
-.q-category {
-  display: inline-block;
-  background: var(--teal); color: white;
-  border-radius: 100px; padding: 3px 14px;
-  font-size: 0.75rem; font-weight: 600;
-  letter-spacing: 0.06em; text-transform: uppercase;
-  margin-bottom: 10px;
-}
-.q-text {
-  font-family: 'Playfair Display', serif;
-  font-size: 1.25rem; color: var(--ink); line-height: 1.55;
-}
-
-/* ── Score ring ───────────────────────────────────────────────── */
-.score-ring {
-  width: 100px; height: 100px;
-  border-radius: 50%;
-  display: flex; flex-direction: column;
-  align-items: center; justify-content: center;
-  font-family: 'Playfair Display', serif;
-  font-weight: 800; margin: 0 auto;
-}
-.score-A { background: linear-gradient(135deg,#2d7a4f,#52b788); color:white; }
-.score-B { background: linear-gradient(135deg,#2d7a4f,#74c69d); color:white; }
-.score-C { background: linear-gradient(135deg,#d4813a,#f0a96e); color:white; }
-.score-D { background: linear-gradient(135deg,#c0392b,#e55039); color:white; }
-.score-F { background: linear-gradient(135deg,#922b21,#c0392b); color:white; }
-
-/* ── STAR bar ─────────────────────────────────────────────────── */
-.star-row {
-  display:flex; align-items:center; gap:10px;
-  margin-bottom:8px; font-size:0.85rem;
-}
-.star-label { width:90px; color:var(--ink-mid); font-weight:500; }
-.star-track {
-  flex:1; height:8px; background:#e8e8ee; border-radius:100px; overflow:hidden;
-}
-.star-fill { height:100%; border-radius:100px; background:linear-gradient(90deg,var(--teal),var(--teal-lt)); }
-.star-val { width:36px; text-align:right; color:var(--teal); font-weight:700; font-size:0.82rem; }
-
-/* ── Progress strip ───────────────────────────────────────────── */
-.progress-strip {
-  display:flex; gap:6px; margin-bottom:1.2rem;
-}
-.prog-dot {
-  height:6px; flex:1; border-radius:100px; background:#e0e0ee;
-}
-.prog-done { background:var(--teal); }
-.prog-current { background:var(--amber); }
-
-/* ── Category badge colours ───────────────────────────────────── */
-.cat-Opener      { background:#0d7377; }
-.cat-Behavioral  { background:#6354a5; }
-.cat-Technical   { background:#1565c0; }
-.cat-Situational { background:#2d7a4f; }
-.cat-Leadership  { background:#b45309; }
-.cat-Cultural    { background:#c2185b; }
-.cat-Gap         { background:#922b21; }
-.cat-Closing     { background:#374151; }
-
-/* ── Feedback blocks ──────────────────────────────────────────── */
-.fb-green {
-  background:#f0fdf4; border-left:3px solid #2d7a4f;
-  border-radius:0 10px 10px 0; padding:10px 14px;
-  font-size:0.88rem; color:#166534; margin-bottom:6px;
-}
-.fb-amber {
-  background:#fffbeb; border-left:3px solid #d4813a;
-  border-radius:0 10px 10px 0; padding:10px 14px;
-  font-size:0.88rem; color:#92400e; margin-bottom:6px;
-}
-.fb-model {
-  background:#f0f9ff; border:1px solid #7dd3fc;
-  border-radius:12px; padding:14px 16px;
-  font-size:0.9rem; color:#0c4a6e; line-height:1.7;
-}
-
-/* ── Buttons ──────────────────────────────────────────────────── */
-.stButton > button {
-  border-radius: 10px !important;
-  font-family: 'DM Sans', sans-serif !important;
-  font-weight: 600 !important;
-  transition: all 0.2s ease !important;
-  border: none !important;
-}
-.stButton > button[kind="primary"] {
-  background: linear-gradient(135deg, var(--teal), var(--teal-lt)) !important;
-  color: white !important;
-}
-.stButton > button[kind="primary"]:hover {
-  transform: translateY(-1px) !important;
-  box-shadow: 0 6px 20px rgba(13,115,119,0.35) !important;
-}
-.stButton > button[kind="secondary"] {
-  background: var(--paper) !important;
-  color: var(--ink) !important;
-  border: 1px solid rgba(13,115,119,0.25) !important;
-}
-
-/* ── Inputs ───────────────────────────────────────────────────── */
-textarea, input[type="text"] {
-  border-radius: 10px !important;
-  border-color: rgba(13,115,119,0.3) !important;
-  font-family: 'DM Sans', sans-serif !important;
-  background: var(--white) !important;
-  color: var(--ink) !important;
-}
-textarea:focus, input[type="text"]:focus {
-  border-color: var(--teal) !important;
-  box-shadow: 0 0 0 2px rgba(13,115,119,0.15) !important;
-}
-
-/* ── Divider ──────────────────────────────────────────────────── */
-hr { border-color: rgba(13,115,119,0.12); margin: 1.5rem 0; }
+})
+if "_initialized" not in st.session_state:
+    for k, v in DEFAULTS.items():
+        st.session_state.setdefault(k, v)
+    st.session_state.plan_nonce   = secrets.token_hex(8)   # see _cached_plan
+    st.session_state._initialized = True
+
+# ── UI constants ──────────────────────────────────────────────────
+NAV = (("🏠", "Home",            "home"),
+       ("📋", "Setup Session",   "setup"),
+       ("🎤", "Practice Session","session"),
+       ("📊", "My Report",       "report"),
+       ("💬", "Free Chat",       "chat"))
+
+PROVIDER_LABELS = MappingProxyType({
+    "Groq — FREE ⚡":          "groq",
+    "Ollama — Local FREE 🖥️":  "ollama",
+    "OpenAI":                   "openai",
+    "Anthropic (Claude)":       "anthropic",
+    "OpenRouter":               "openrouter",
+})
+
+KEY_PLACEHOLDERS = MappingProxyType({
+    "groq": "gsk_...", "openai": "sk-...", "anthropic": "sk-ant-...", "openrouter": "sk-or-...",
+    "ollama": "http://localhost:11434 (or leave blank)",
+})
+
+FEATURES = (
+    ("🎤", "Live Practice Session",
+     "Alex asks real interview questions tailored to your resume and the job. "
+     "You answer. Alex grades you — honestly."),
+    ("⭐", "STAR Method Grading",
+     "Every answer scored across Situation, Task, Action, Result. "
+     "See exactly where you're strong and where you're losing points."),
+    ("📊", "Personal Session Report",
+     "After 10 questions, get a full coaching report with your score, "
+     "category breakdown, top gaps, and an action plan."),
+    ("💡", "Real-Time Tips",
+     "Stuck? Ask for a hint before you answer. Alex gives you "
+     "specific guidance based on your actual background."),
+    ("💬", "Free Chat Coach",
+     "Outside of practice sessions, chat with Alex about anything — "
+     "nerves, salary negotiation, how to position yourself."),
+    ("🖥️", "100% Free with Ollama",
+     "No API cost. No data leaving your machine. "
+     "Run powerful local models for zero cost with Ollama."),
+)
 
-/* ── Tabs ─────────────────────────────────────────────────────── */
-.stTabs [data-baseweb="tab-list"] {
-  gap: 6px; background: var(--paper);
-  border-radius: 12px; padding: 5px;
-}
-.stTabs [data-baseweb="tab"] {
-  border-radius: 8px !important; font-weight: 500 !important;
-  color: var(--ink-lt) !important;
-}
-.stTabs [aria-selected="true"] {
-  background: var(--teal) !important; color: white !important;
-}
+# Quick-session role picker, grouped by field
+FIELD_SUGGESTIONS = MappingProxyType({
+    "💻 Technology": ("Software Engineer", "Data Analyst", "Data Scientist", "Product Manager",
+                      "DevOps Engineer", "UX Designer", "Cybersecurity Analyst",
+                      "ML Engineer", "Cloud Architect"),
+    "📊 Business": ("Business Analyst", "Project Manager", "Strategy Consultant",
+                    "Operations Manager", "Supply Chain Manager"),
+    "💰 Finance": ("Financial Analyst", "Investment Banker", "Accountant",
+                   "Risk Manager", "Finance Manager"),
+    "🏥 Healthcare": ("Nurse", "Healthcare Administrator", "Clinical Data Analyst",
+                      "Pharmacist", "Public Health Officer"),
+    "📣 Marketing": ("Marketing Manager", "Digital Marketer", "Content Strategist",
+                     "Brand Manager", "Growth Hacker"),
+    "⚖️ Legal & HR": ("HR Manager", "Recruiter", "Legal Counsel",
+                       "Compliance Officer", "Labour Relations"),
+    "🎓 Education": ("Teacher", "Curriculum Developer", "School Administrator",
+                      "Corporate Trainer", "EdTech Specialist"),
+})
+
+ALL_ROLES   = tuple(r for roles in FIELD_SUGGESTIONS.values() for r in roles)
+ROLE_LABELS = MappingProxyType({r: f"{cat.split(' ', 1)[0]} {r}"
+                                for cat, roles in FIELD_SUGGESTIONS.items() for r in roles})
+
+EXPERIENCE_LEVELS = ("Student / Intern", "Entry Level (0–2 yrs)",
+                     "Mid Level (3–5 yrs)", "Senior (6–10 yrs)",
+                     "Lead / Principal (10+ yrs)", "Executive / Director")
+
+FOCUS_OPTIONS = ("Behavioral", "Technical", "Situational", "Leadership", "Culture Fit")
+DEFAULT_FOCUS = frozenset({"Behavioral", "Technical", "Situational"})
+
+DIFF_COLORS = MappingProxyType({"Easy": "#2d7a4f", "Medium": "#d4813a", "Hard": "#c0392b"})
 
-/* ── Mode selector radio — styled as toggle tabs ─────────────── */
-[data-testid="stRadio"] > div {
-  display: flex !important;
-  gap: 8px !important;
-  flex-direction: row !important;
-}
-[data-testid="stRadio"] label {
-  border: 1.5px solid rgba(13,115,119,0.25) !important;
-  border-radius: 10px !important;
-  padding: 10px 18px !important;
-  cursor: pointer !important;
-  transition: all 0.2s ease !important;
-  font-weight: 500 !important;
-  color: var(--ink-mid) !important;
-  background: var(--white) !important;
-  flex: 1 !important;
-  text-align: center !important;
-}
-[data-testid="stRadio"] label:has(input:checked) {
-  background: var(--teal) !important;
-  border-color: var(--teal) !important;
-  color: white !important;
-  font-weight: 600 !important;
-}
-[data-testid="stRadio"] label span { pointer-events: none; }
-[data-testid="stRadio"] input[type="radio"] { display: none !important; }
+# ── CSS ───────────────────────────────────────────────────────────
+_CSS_PATH = _ROOT / "assets" / "theme.css"
 
-/* ── Checkbox row for focus areas ────────────────────────────── */
-[data-testid="stCheckbox"] label {
-  font-size: 0.88rem !important;
-  color: var(--ink-mid) !important;
-}
+@st.cache_resource
+def _css() -> str:
+    """Theme stylesheet, read and minified once per process."""
+    raw = _CSS_PATH.read_text(encoding="utf-8")
+    raw = re.sub(r"/\*.*?\*/", "", raw, flags=re.S)
+    raw = re.sub(r"\s+", " ", raw).strip()
+    return f"<style>{raw}</style>"
 
-/* ── Select slider ────────────────────────────────────────────── */
-[data-testid="stSlider"] [data-testid="stTickBar"] span {
-  font-size: 0.7rem !important;
-}
 
-/* ── Report category bars ─────────────────────────────────────── */
-.rpt-bar-wrap { margin-bottom: 10px; }
-.rpt-bar-label { display:flex; justify-content:space-between; font-size:0.83rem; margin-bottom:3px; }
-.rpt-bar-track { height:8px; background:#e8e8ee; border-radius:100px; }
-.rpt-bar-fill  { height:8px; border-radius:100px; background:linear-gradient(90deg,#0d7377,#14a8ad); }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(_css(), unsafe_allow_html=True)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -378,20 +188,213 @@ hr { border-color: rgba(13,115,119,0.12); margin: 1.5rem 0; }
 # ══════════════════════════════════════════════════════════════════
 # HELPERS
 # ══════════════════════════════════════════════════════════════════
-def _go(page): st.session_state.page = page; st.rerun()
-def _api(): return st.session_state.api_key
-def _prov(): return st.session_state.provider
-def _model(): return st.session_state.model
-def _ready(): return st.session_state.connected
-def _has_context(): return bool(st.session_state.resume_text or st.session_state.jd_text)
-
-GRADE_COLORS = {"A":"#2d7a4f","B":"#52b788","C":"#d4813a","D":"#e55039","F":"#c0392b"}
+ss = st.session_state   # short alias for hot paths: ss.api_key, ss.provider, ss.model
+
+def _go(page):
+    if st.session_state.page == page:
+        return                      # already there — skip the full rerun
+    st.session_state.page = page
+    st.rerun()
+
+# ── Keyed text inputs ─────────────────────────────────────────────
+# Text widgets own their value via key= rather than echoing it back into
+# session_state on every run. Widget keys are dropped whenever the widget
+# isn't rendered (another page, the other setup mode), so each one mirrors a
+# persistent state key: seeded before render, synced back on change.
+_BOUND = {"resume_text": "resume_box", "jd_text": "jd_box", "quick_field": "field_input_box"}
+_HASHED = {"resume_text": "resume_hash", "jd_text": "jd_hash"}
+
+def _fingerprint(text):
+    """Short digest of a document, "" when it is blank. Computed only when the
+    text changes, so a non-empty fingerprint doubles as the "has text" flag."""
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest() if text.strip() else ""
+
+def _store(state_key, value):
+    """Set a bound state key, refreshing its fingerprint when it has one."""
+    ss[state_key] = value
+    if state_key in _HASHED:
+        ss[_HASHED[state_key]] = _fingerprint(value)
+
+def _bind(state_key):
+    """Seed the widget key for state_key; call before the widget renders."""
+    wk = _BOUND[state_key]
+    if wk not in ss:
+        ss[wk] = ss[state_key]
+    return wk
+
+def _sync(state_key):
+    _store(state_key, ss[_BOUND[state_key]])
+
+def _set_bound(state_key, value):
+    """Write a bound value from a callback or before its widget renders."""
+    _store(state_key, value)
+    ss[_BOUND[state_key]] = value
+
+def _pick_role():
+    """Role form submit: copy the pick into quick_field, then reset the picker."""
+    if ss.role_pick:
+        _set_bound("quick_field", ss.role_pick)
+        ss.role_pick = None
+
+def _clear_docs():
+    _set_bound("resume_text", "")
+    _set_bound("jd_text", "")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_ollama_models(key: str) -> dict:
+    """Installed Ollama models, probed at most once a minute per server URL.
+    Connect clears this, so a fresh pull shows up as soon as you reconnect."""
+    return get_ollama_models(key)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_extract(name: str, data: bytes) -> tuple[str, str]:
+    """Parse an uploaded document once per unique file; reruns hit the cache."""
+    buf = io.BytesIO(data)
+    buf.name = name
+    return extract_text(buf)
+
+# ── Cached LLM calls ──────────────────────────────────────────────
+# Keyed on provider, model and prompt inputs so a rerun (or a repeat click)
+# with identical inputs never re-issues the request. Leading underscores keep
+# the API key and the resume/JD text out of the cache key; the documents are
+# keyed by the fingerprint pair from _docs() instead of being re-hashed.
+# Each wrapper is bounded as well, so a busy server drops its oldest
+# responses rather than holding an hour of them.
+_LLM_TTL = 3600
+_LLM_ENTRIES = 256
+
+def _docs():
+    """(resume, jd, fingerprints) — the trailing arguments of the wrappers below."""
+    return ss.resume_text, ss.jd_text, (ss.resume_hash, ss.jd_hash)
+
+# The plan wrappers also take ss.plan_nonce, which is random per browser
+# session and renewed by each launch: a repeat click before the session starts
+# reuses the plan, but practising again builds a fresh one.
+@st.cache_data(ttl=_LLM_TTL, max_entries=_LLM_ENTRIES, show_spinner=False)
+def _cached_plan(_api_key, provider, model, _resume, _jd, docs, nonce):
+    return build_session_plan(_api_key, provider, model,
+                              _resume or "No resume provided.",
+                              _jd or "General interview — no specific role.")
+
+@st.cache_data(ttl=_LLM_TTL, max_entries=_LLM_ENTRIES, show_spinner=False)
+def _cached_field_plan(_api_key, provider, model, field, exp_level, focus, nonce):
+    return build_field_plan(_api_key, provider, model, field, exp_level, list(focus))
+
+# Streamed calls can't use st.cache_data: it records the elements their
+# on_delta callback draws and replays them on a hit, which raises
+# CacheReplayClosureError. Their replies are kept in this browser session's
+# state instead (never shared between users, whose keys paid for them), keyed
+# on the document fingerprints rather than the texts, and only called (and
+# streamed) on a miss.
+def _memo(key: tuple, call):
+    """Cached result for `key`, else call() and keep a copy of its result.
+    Expired entries and any past _LLM_ENTRIES are pruned on each write."""
+    store = ss.setdefault("_replies", OrderedDict())
+    now = time.monotonic()
+    hit = store.get(key)
+    if hit and now - hit[0] < _LLM_TTL:
+        return copy.deepcopy(hit[1])
+    value = call()
+    store[key] = (now, copy.deepcopy(value))
+    store.move_to_end(key)
+    for k in [k for k, (t, _) in store.items() if now - t >= _LLM_TTL]:
+        del store[k]
+    while len(store) > _LLM_ENTRIES:
+        store.popitem(last=False)
+    return value
+
+def _digest(obj) -> str:
+    """Stable key for list/dict arguments (session data, chat history)."""
+    blob = json.dumps(obj, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+def _cached_tip(api_key, provider, model, q_text, q_cat, resume, jd, docs, on_delta=None):
+    return _memo(("tip", provider, model, q_text, q_cat, docs),
+                 lambda: get_question_tip(api_key, provider, model, q_text, q_cat,
+                                          resume, jd, on_delta=on_delta))
+
+def _cached_grade(api_key, provider, model, q_text, answer, q_cat, resume, jd, docs,
+                  on_delta=None):
+    return _memo(("grade", provider, model, q_text, answer, q_cat, docs),
+                 lambda: grade_answer(api_key, provider, model, q_text, answer, q_cat,
+                                      resume, jd, on_delta=on_delta))
+
+def _cached_followup(api_key, provider, model, history, resume, jd, docs, on_delta=None):
+    return _memo(("followup", provider, model, _digest(history), docs),
+                 lambda: coach_followup(api_key, provider, model, history, resume, jd,
+                                        on_delta=on_delta))
+
+def _cached_report(api_key, provider, model, data, resume, jd, docs, on_delta=None):
+    return _memo(("report", provider, model, _digest(data), docs),
+                 lambda: build_session_report(api_key, provider, model, data, resume, jd,
+                                              on_delta=on_delta))
+
+def _stream_progress(every=120):
+    """on_delta callback for a streamed call: a caption counting the response as it arrives.
+    Redrawn every `every` characters rather than per token to keep reruns light."""
+    box, seen = st.empty(), [0]
+    def on_delta(chunk):
+        before = seen[0]
+        seen[0] += len(chunk)
+        if seen[0] // every != before // every:
+            box.caption(f"✍️ Alex is writing… {seen[0]:,} characters so far")
+    return on_delta
+
+def _stream_grade(every=160):
+    """on_delta callback for a streamed grade. The reply is parsed as it grows
+    (partial_json), so the score ring appears as soon as score and grade have
+    arrived and the coach's reaction fills in after it; until then it falls
+    back to the character count. A cut that doesn't parse (a key with no
+    value yet) keeps the previous view. Partials use the uncached builders,
+    and a partial that fails to render shows the count instead, since an
+    error raised here would abort a stream that is no longer retried."""
+    box, parts, seen, last = st.empty(), [], [0], [{}]
+    def on_delta(chunk):
+        parts.append(chunk)
+        before = seen[0]
+        seen[0] += len(chunk)
+        if seen[0] // every == before // every:
+            return
+        try:
+            g = partial_json("".join(parts)) or last[0]
+            if g.get("grade"):          # score is only final once grade follows it
+                last[0] = g
+                with box.container():
+                    c1, c2 = st.columns([1, 3], gap="large")
+                    c1.markdown(grade_ring_html.__wrapped__(g.get("score", 0), g["grade"]),
+                                unsafe_allow_html=True)
+                    c2.markdown(coach_bubble_html.__wrapped__(
+                        (g.get("coach_reaction") or "") + " ▌"), unsafe_allow_html=True)
+                return
+        except Exception:
+            pass
+        box.caption(f"✍️ Alex is writing… {seen[0]:,} characters so far")
+    return on_delta
+
+def _stream_bubble(box, every=40, render=coach_bubble_html):
+    """on_delta callback that grows a coach bubble (or whatever `render`
+    builds) in `box` (an st.empty) as a reply streams in, redrawn every
+    `every` characters. Partials use the builder's uncached __wrapped__, so
+    one-off prefixes don't evict its lru_cache; the final text goes through
+    the cached builder on the rerun."""
+    render, parts, seen = getattr(render, "__wrapped__", render), [], [0]
+    def on_delta(chunk):
+        parts.append(chunk)
+        before = seen[0]
+        seen[0] += len(chunk)
+        if seen[0] // every != before // every:
+            box.markdown(render("".join(parts) + " ▌"), unsafe_allow_html=True)
+    return on_delta
+
+GRADE_COLORS = MappingProxyType({"A":"#2d7a4f","B":"#52b788","C":"#d4813a","D":"#e55039","F":"#c0392b"})
 
 def _launch_session(plan):
     """Shared helper — stores plan and navigates to session page."""
     st.session_state.session_plan     = plan
+    st.session_state.plan_nonce       = secrets.token_hex(8)
     st.session_state.current_q_idx   = 0
     st.session_state.session_data     = []
+    st.session_state.qa_scores        = []
     st.session_state.last_grade       = None
     st.session_state.show_tip         = False
     st.session_state.followup_mode   = False
@@ -399,17 +402,69 @@ def _launch_session(plan):
     st.session_state.session_report   = None
     _go("session")
 
+# ── Session snapshot ──────────────────────────────────────────────
+# The plan, graded answers and report cost real tokens, so they are mirrored
+# to a small JSON file keyed by a ?sid= query param and restored after a
+# browser refresh. Written at the start of a run when the tracked state has
+# changed (every mutation is followed by a rerun); best-effort only. The
+# resume and JD themselves are never written to disk.
+# The sid is a 128-bit random bearer token: anyone holding the URL can load
+# that session's answers and report until the file expires, so the link
+# should be treated like a password and not shared.
+_SNAPSHOT_DIR   = _ROOT / ".session_cache"
+_SNAPSHOT_LIMIT = 200                     # files kept; oldest by mtime go first
+_SNAPSHOT_TTL   = 24 * 3600               # seconds; older files are ignored and pruned
+_SNAPSHOT_KEYS  = ("session_plan", "session_data", "session_report", "current_q_idx",
+                   "last_grade", "qa_scores")
+_SID_RE = re.compile(r"[0-9a-f]{32}")
+
+def _snapshot_blob() -> tuple[str, bytes]:
+    """(JSON of the tracked keys, its digest). The digest catches in-place
+    edits too, which identity and length checks would miss."""
+    blob = json.dumps({k: ss[k] for k in _SNAPSHOT_KEYS}, default=str)
+    return blob, hashlib.blake2b(blob.encode(), digest_size=16).digest()
+
+def _restore_session():
+    sid = st.query_params.get("sid", "")
+    if not _SID_RE.fullmatch(sid):
+        sid = secrets.token_hex(16)
+        st.query_params["sid"] = sid
+    ss._snapshot_path = _SNAPSHOT_DIR / f"{sid}.json"
+    try:
+        if time.time() - ss._snapshot_path.stat().st_mtime > _SNAPSHOT_TTL:
+            raise OSError("snapshot expired")
+        snap = json.loads(ss._snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        snap = {}
+    for k in _SNAPSHOT_KEYS:
+        if k in snap:
+            ss[k] = snap[k]
+    if snap.get("session_plan"):
+        # land back where the refresh left off rather than on Home
+        ss.page = "report" if snap.get("session_report") else "session"
+    ss._snapshot_sig = _snapshot_blob()[1]
+
+def _persist_session():
+    blob, sig = _snapshot_blob()
+    if sig == ss._snapshot_sig:
+        return
+    ss._snapshot_sig = sig
+    path = ss._snapshot_path
+    try:
+        _SNAPSHOT_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(blob, encoding="utf-8")
+        os.replace(tmp, path)
+        snaps = sorted((p.stat().st_mtime, p) for p in _SNAPSHOT_DIR.glob("*.json"))
+        cutoff = time.time() - _SNAPSHOT_TTL
+        for i, (mtime, old) in enumerate(snaps):
+            if mtime < cutoff or i < len(snaps) - _SNAPSHOT_LIMIT:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 def score_bar(label, val, max_val=25):
-    pct = int(val / max_val * 100)
-    color = "#2d7a4f" if pct >= 80 else "#d4813a" if pct >= 50 else "#c0392b"
-    st.markdown(f"""
-    <div class="star-row">
-      <span class="star-label">{label}</span>
-      <div class="star-track">
-        <div class="star-fill" style="width:{pct}%;background:{color}"></div>
-      </div>
-      <span class="star-val" style="color:{color}">{val}/{max_val}</span>
-    </div>""", unsafe_allow_html=True)
+    st.markdown(score_bar_html(label, val, max_val), unsafe_allow_html=True)
 
 
 def rubric_breakdown(grade_result: dict, category: str):
@@ -439,40 +494,41 @@ def rubric_breakdown(grade_result: dict, category: str):
         score_bar(label, rubric.get(key, 0))
 
 
-def rpt_bar(label, score):
-    c = "#2d7a4f" if score>=80 else "#d4813a" if score>=60 else "#c0392b"
-    st.markdown(f"""
-    <div class="rpt-bar-wrap">
-      <div class="rpt-bar-label">
-        <span style="color:var(--ink-mid);font-weight:500">{label}</span>
-        <span style="color:{c};font-weight:700">{score}/100</span>
-      </div>
-      <div class="rpt-bar-track"><div class="rpt-bar-fill" style="width:{score}%;background:{c}"></div></div>
-    </div>""", unsafe_allow_html=True)
+def _report_download(rpt, data):
+    """TXT export bytes, rebuilt only when a new report object arrives.
+    Holding the report itself (not its id) means a stale entry can never match."""
+    memo = ss.get("_report_txt")
+    if memo is None or memo[0] is not rpt or memo[1] != len(data):
+        memo = ss._report_txt = (rpt, len(data), report_txt(rpt, data))
+    return memo[2]
 
 
 def progress_strip(total, current):
-    dots = []
-    for i in range(total):
-        cls = "prog-done" if i < current else ("prog-current" if i == current else "prog-dot")
-        dots.append(f'<div class="prog-dot {cls}"></div>')
-    st.markdown(f'<div class="progress-strip">{"".join(dots)}</div>', unsafe_allow_html=True)
+    st.markdown(progress_html(total, current), unsafe_allow_html=True)
+
+
+@st.fragment
+def _nav_fragment():
+    """Sidebar nav. A click reruns only this fragment until _go() asks for a full rerun."""
+    for icon, label, key in NAV:
+        active = st.session_state.page == key
+        if st.button(f"{icon} {label}", key=f"nav_{key}", use_container_width=True,
+                     type="primary" if active else "secondary"):
+            _go(key)
 
 
 def coach_bubble(text, label="Coach Alex"):
-    st.markdown(f"""
-    <div class="bubble-coach">
-      <div class="bubble-label label-coach">🎙️ {label}</div>
-      {text}
-    </div>""", unsafe_allow_html=True)
+    st.markdown(coach_bubble_html(text, label), unsafe_allow_html=True)
 
 
 def user_bubble(text):
-    st.markdown(f"""
-    <div class="bubble-user">
-      <div class="bubble-label label-user">You 👤</div>
-      {text}
-    </div>""", unsafe_allow_html=True)
+    st.markdown(user_bubble_html(text), unsafe_allow_html=True)
+
+
+if "_snapshot_sig" not in ss:
+    _restore_session()
+else:
+    _persist_session()
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -495,16 +551,9 @@ with st.sidebar:
                 "text-transform:uppercase;letter-spacing:1px;margin-bottom:6px'>"
                 "🔌 AI Provider</div>", unsafe_allow_html=True)
 
-    prov_labels = {
-        "Groq — FREE ⚡":          "groq",
-        "Ollama — Local FREE 🖥️":  "ollama",
-        "OpenAI":                   "openai",
-        "Anthropic (Claude)":       "anthropic",
-        "OpenRouter":               "openrouter",
-    }
-    sel_prov = st.selectbox("Provider", list(prov_labels.keys()),
+    sel_prov = st.selectbox("Provider", list(PROVIDER_LABELS.keys()),
                              label_visibility="collapsed")
-    provider = prov_labels[sel_prov]
+    provider = PROVIDER_LABELS[sel_prov]
 
     if provider == "ollama":
         st.markdown("""
@@ -519,25 +568,29 @@ with st.sidebar:
 
     # For Ollama: dynamically show actually-installed models
     if provider == "ollama":
-        models = get_ollama_models(
+        models = _cached_ollama_models(
             st.session_state.api_key if st.session_state.provider == "ollama" else ""
         )
     else:
         models = PROVIDER_MODELS.get(provider, {})
-    sel_model = st.selectbox("Model", list(models.keys()), label_visibility="collapsed")
-
-    placeholder = {"groq":"gsk_...","openai":"sk-...","anthropic":"sk-ant-...","openrouter":"sk-or-...",
-                   "ollama":"http://localhost:11434 (or leave blank)"}
-    api_key_in = st.text_input(
-        "API Key" if provider != "ollama" else "Ollama URL",
-        value=st.session_state.api_key if st.session_state.provider == provider else "",
-        type="password" if provider != "ollama" else "default",
-        placeholder=placeholder.get(provider, ""),
-        key=f"key_{provider}"
-    )
 
-    if st.button("✅ Connect", type="primary", use_container_width=True):
-        key_val = (api_key_in or "").strip()  # empty string is fine for Ollama — _ollama_base handles default
+    # Model + key are batched in a form: typing the key no longer reruns the
+    # script; only Connect does. The provider selectbox stays outside so that
+    # switching provider still refreshes the model list immediately.
+    with st.form("connect_form", border=False):
+        sel_model = st.selectbox("Model", list(models.keys()), label_visibility="collapsed")
+
+        api_key_in = st.text_input(
+            "API Key" if provider != "ollama" else "Ollama URL",
+            value=st.session_state.api_key if st.session_state.provider == provider else "",
+            type="password" if provider != "ollama" else "default",
+            placeholder=KEY_PLACEHOLDERS.get(provider, ""),
+            key=f"key_{provider}"
+        )
+        connect = st.form_submit_button("✅ Connect", type="primary", use_container_width=True)
+
+    if connect:
+        key_val = (api_key_in or "").strip()  # empty string is fine for Ollama — _ollama_root handles default
         if key_val or provider == "ollama":
             with st.spinner("Connecting…"):
                 ok, msg = verify_connection(key_val, provider)
@@ -546,7 +599,8 @@ with st.sidebar:
                 st.session_state.provider = provider
                 # For Ollama, re-fetch models now that we're connected
                 if provider == "ollama":
-                    live_models = get_ollama_models(key_val)
+                    _cached_ollama_models.clear()
+                    live_models = _cached_ollama_models(key_val)
                     # Use first available model as default if current selection invalid
                     model_val = live_models.get(sel_model, list(live_models.values())[0])
                 else:
@@ -586,17 +640,7 @@ with st.sidebar:
                 "text-transform:uppercase;letter-spacing:1px;margin-bottom:10px'>"
                 "Navigation</div>", unsafe_allow_html=True)
 
-    nav = [("🏠", "Home",            "home"),
-           ("📋", "Setup Session",   "setup"),
-           ("🎤", "Practice Session","session"),
-           ("📊", "My Report",       "report"),
-           ("💬", "Free Chat",       "chat")]
-
-    for icon, label, key in nav:
-        active = st.session_state.page == key
-        if st.button(f"{icon} {label}", key=f"nav_{key}", use_container_width=True,
-                     type="primary" if active else "secondary"):
-            _go(key)
+    _nav_fragment()
 
     st.markdown("---")
     st.markdown("""
@@ -627,51 +671,28 @@ def page_home():
       </div>
     </div>""", unsafe_allow_html=True)
 
-    if not _ready():
+    if not ss.connected:
         st.info("👈 **First step:** Connect your AI provider in the sidebar. "
                 "**Groq is free** — [get a key in 30 seconds](https://console.groq.com/keys). "
                 "Or **Ollama** runs entirely on your machine at zero cost.", icon="🔑")
 
     # Feature cards
     cols = st.columns(3, gap="medium")
-    features = [
-        ("🎤", "Live Practice Session",
-         "Alex asks real interview questions tailored to your resume and the job. "
-         "You answer. Alex grades you — honestly."),
-        ("⭐", "STAR Method Grading",
-         "Every answer scored across Situation, Task, Action, Result. "
-         "See exactly where you're strong and where you're losing points."),
-        ("📊", "Personal Session Report",
-         "After 10 questions, get a full coaching report with your score, "
-         "category breakdown, top gaps, and an action plan."),
-        ("💡", "Real-Time Tips",
-         "Stuck? Ask for a hint before you answer. Alex gives you "
-         "specific guidance based on your actual background."),
-        ("💬", "Free Chat Coach",
-         "Outside of practice sessions, chat with Alex about anything — "
-         "nerves, salary negotiation, how to position yourself."),
-        ("🖥️", "100% Free with Ollama",
-         "No API cost. No data leaving your machine. "
-         "Run powerful local models for zero cost with Ollama."),
-    ]
-    for i, (icon, title, desc) in enumerate(features):
-        with cols[i % 3]:
-            st.markdown(f"""
-            <div class="card" style="height:100%;min-height:140px">
+    col_html = [[], [], []]
+    for i, (icon, title, desc) in enumerate(FEATURES):
+        col_html[i % 3].append(f"""
+            <div class="card" style="min-height:140px">
               <div style="font-size:1.8rem;margin-bottom:8px">{icon}</div>
               <div style="font-family:'Playfair Display',serif;font-size:1rem;
                           font-weight:700;color:var(--ink);margin-bottom:6px">{title}</div>
               <div style="font-size:0.87rem;color:var(--ink-lt);line-height:1.6">{desc}</div>
-            </div>""", unsafe_allow_html=True)
-        if i == 2:
-            cols2 = st.columns(3, gap="medium")
-            for j in range(3):
-                cols[j] = cols2[j]
-
-    st.markdown("<br>", unsafe_allow_html=True)
+            </div>""")
+    for col, cards in zip(cols, col_html):
+        with col:
+            st.markdown("".join(cards), unsafe_allow_html=True)
 
     # CTA
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<br><br>", unsafe_allow_html=True)
     cta1, cta2 = st.columns(2, gap="medium")
     with cta1:
         st.markdown("""
@@ -709,7 +730,7 @@ def page_home():
 # PAGE: SETUP
 # ══════════════════════════════════════════════════════════════════
 def page_setup():
-    if not _ready():
+    if not ss.connected:
         st.warning("⚠️ Connect your AI provider in the sidebar first.")
         return
 
@@ -753,16 +774,18 @@ def page_setup():
                 f = st.file_uploader("Resume", type=["pdf","docx","txt"],
                                      label_visibility="collapsed", key="resume_upload")
                 if f:
-                    t, err = extract_text(f)
+                    t, err = _cached_extract(f.name, f.getvalue())
                     if err: st.error(err)
                     else:
-                        st.session_state.resume_text = clean(t)
+                        t = clean(t)
+                        if t != ss.resume_text:
+                            _set_bound("resume_text", t)
                         st.success(f"✅ {f.name} — {len(t.split())} words extracted")
             with paste_tab:
-                rt = st.text_area("Resume text", value=st.session_state.resume_text,
-                                  height=260, label_visibility="collapsed",
-                                  placeholder="Paste your full resume here…")
-                st.session_state.resume_text = rt
+                st.text_area("Resume text", key=_bind("resume_text"),
+                             on_change=_sync, args=("resume_text",),
+                             height=260, label_visibility="collapsed",
+                             placeholder="Paste your full resume here…")
 
         with col_r:
             st.markdown("#### 🏢 Job Description")
@@ -771,32 +794,28 @@ def page_setup():
                 fj = st.file_uploader("JD", type=["pdf","docx","txt"],
                                       label_visibility="collapsed", key="jd_upload")
                 if fj:
-                    t, err = extract_text(fj)
+                    t, err = _cached_extract(fj.name, fj.getvalue())
                     if err: st.error(err)
                     else:
-                        st.session_state.jd_text = clean(t)
+                        t = clean(t)
+                        if t != ss.jd_text:
+                            _set_bound("jd_text", t)
                         st.success(f"✅ {fj.name} — {len(t.split())} words extracted")
             with paste_jd:
-                jt = st.text_area("JD text", value=st.session_state.jd_text,
-                                  height=260, label_visibility="collapsed",
-                                  placeholder="Paste the full job description here…")
-                st.session_state.jd_text = jt
+                st.text_area("JD text", key=_bind("jd_text"),
+                             on_change=_sync, args=("jd_text",),
+                             height=260, label_visibility="collapsed",
+                             placeholder="Paste the full job description here…")
 
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Status indicators
-        has_resume = bool(st.session_state.resume_text.strip())
-        has_jd     = bool(st.session_state.jd_text.strip())
-        c1, c2, c3 = st.columns(3)
-        for col, ok, label in [(c1, has_resume, "Resume"),
-                               (c2, has_jd,     "Job Description"),
-                               (c3, _ready(),   f"AI ({st.session_state.provider.upper()})")]:
-            with col:
-                st.markdown(f"""
-                <div class="card-cream" style="text-align:center;padding:12px">
-                  <div style="font-size:1.4rem">{"✅" if ok else "⭕"}</div>
-                  <div style="font-size:0.82rem;color:var(--ink-mid);margin-top:3px">{label}</div>
-                </div>""", unsafe_allow_html=True)
+        has_resume = bool(ss.resume_hash)
+        has_jd     = bool(ss.jd_hash)
+        st.markdown(status_grid_html(((has_resume, "Resume"),
+                                      (has_jd, "Job Description"),
+                                      (ss.connected, f"AI ({ss.provider.upper()})"))),
+                    unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
 
@@ -809,17 +828,13 @@ def page_setup():
             if st.button("🎤 Start Full Session", type="primary", use_container_width=True):
                 with st.spinner("Alex is reviewing your materials and preparing your session…"):
                     try:
-                        resume = st.session_state.resume_text or "No resume provided."
-                        jd     = st.session_state.jd_text or "General interview — no specific role."
-                        plan   = build_session_plan(_api(), _prov(), _model(), resume, jd)
+                        plan = _cached_plan(ss.api_key, ss.provider, ss.model, *_docs(),
+                                            ss.plan_nonce)
                         _launch_session(plan)
                     except Exception as e:
                         st.error(f"Couldn't build session: {e}")
         with cb2:
-            if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state.resume_text = ""
-                st.session_state.jd_text = ""
-                st.rerun()
+            st.button("🗑️ Clear", use_container_width=True, on_click=_clear_docs)
 
     # ══════════════════════════════════════════════════════════════
     # MODE B — Quick session, field only
@@ -839,54 +854,31 @@ def page_setup():
         </div>""", unsafe_allow_html=True)
 
         col_a, col_b = st.columns([3, 2], gap="large")
+        field_val = ss.quick_field.strip()   # final for this run — edits land via callbacks
 
         with col_a:
-            # Popular field suggestions
-            FIELD_SUGGESTIONS = {
-                "💻 Technology": ["Software Engineer", "Data Analyst", "Data Scientist", "Product Manager",
-                                  "DevOps Engineer", "UX Designer", "Cybersecurity Analyst",
-                                  "ML Engineer", "Cloud Architect"],
-                "📊 Business": ["Business Analyst", "Project Manager", "Strategy Consultant",
-                                "Operations Manager", "Supply Chain Manager"],
-                "💰 Finance": ["Financial Analyst", "Investment Banker", "Accountant",
-                               "Risk Manager", "Finance Manager"],
-                "🏥 Healthcare": ["Nurse", "Healthcare Administrator", "Clinical Data Analyst",
-                                  "Pharmacist", "Public Health Officer"],
-                "📣 Marketing": ["Marketing Manager", "Digital Marketer", "Content Strategist",
-                                 "Brand Manager", "Growth Hacker"],
-                "⚖️ Legal & HR": ["HR Manager", "Recruiter", "Legal Counsel",
-                                   "Compliance Officer", "Labour Relations"],
-                "🎓 Education": ["Teacher", "Curriculum Developer", "School Administrator",
-                                  "Corporate Trainer", "EdTech Specialist"],
-            }
-
             st.markdown("**🏷️ Your Job Field / Role Title**")
-            field_input = st.text_input(
+            st.text_input(
                 "Field",
-                value=st.session_state.get("quick_field", ""),
                 placeholder="e.g. Software Engineer, Data Analyst, Product Manager…",
                 label_visibility="collapsed",
-                key="field_input_box"
+                key=_bind("quick_field"),
+                on_change=_sync, args=("quick_field",),
             )
-            st.session_state.quick_field = field_input
 
             st.markdown("<div style='font-size:0.8rem;color:var(--ink-lt);margin:8px 0 4px'>Or pick from common roles:</div>", unsafe_allow_html=True)
-            for category, roles in FIELD_SUGGESTIONS.items():
-                with st.expander(category):
-                    role_cols = st.columns(2)
-                    for ri, role in enumerate(roles):
-                        with role_cols[ri % 2]:
-                            if st.button(role, key=f"role_{role}", use_container_width=True):
-                                st.session_state.quick_field = role
-                                st.rerun()
+            with st.form("role_form", border=False):
+                st.selectbox("Role", ALL_ROLES, index=None, key="role_pick",
+                             format_func=ROLE_LABELS.get, label_visibility="collapsed",
+                             placeholder="Choose a role…")
+                st.form_submit_button("Use this role", use_container_width=True,
+                                      on_click=_pick_role)
 
         with col_b:
             st.markdown("**📈 Experience Level**")
             exp_level = st.select_slider(
                 "Experience",
-                options=["Student / Intern", "Entry Level (0–2 yrs)",
-                         "Mid Level (3–5 yrs)", "Senior (6–10 yrs)",
-                         "Lead / Principal (10+ yrs)", "Executive / Director"],
+                options=EXPERIENCE_LEVELS,
                 value=st.session_state.get("quick_exp", "Mid Level (3–5 yrs)"),
                 label_visibility="collapsed",
             )
@@ -895,43 +887,23 @@ def page_setup():
             st.markdown("<br>", unsafe_allow_html=True)
             st.markdown("**🎯 Focus Areas**")
             st.caption("Which question types do you want to practise?")
-            focus_options = ["Behavioral", "Technical", "Situational", "Leadership", "Culture Fit"]
             selected_focus = []
             focus_cols = st.columns(2)
-            for fi, fo in enumerate(focus_options):
+            for fi, fo in enumerate(FOCUS_OPTIONS):
                 with focus_cols[fi % 2]:
-                    default_checked = fo in ["Behavioral", "Technical", "Situational"]
-                    if st.checkbox(fo, value=default_checked, key=f"focus_{fo}"):
+                    if st.checkbox(fo, value=fo in DEFAULT_FOCUS, key=f"focus_{fo}"):
                         selected_focus.append(fo)
 
             st.markdown("<br>", unsafe_allow_html=True)
 
             # Preview card
-            field_val = st.session_state.get("quick_field", "").strip()
             if field_val:
-                st.markdown(f"""
-                <div style="background:var(--ink);border-radius:12px;padding:14px 16px;color:white">
-                  <div style="font-size:0.72rem;color:rgba(255,255,255,0.5);
-                              text-transform:uppercase;letter-spacing:0.08em;margin-bottom:8px">
-                      Session Preview
-                  </div>
-                  <div style="font-family:'Playfair Display',serif;font-size:1rem;
-                              font-weight:700;margin-bottom:4px">{field_val}</div>
-                  <div style="font-size:0.82rem;color:rgba(255,255,255,0.65);margin-bottom:6px">
-                      {exp_level}
-                  </div>
-                  <div style="font-size:0.8rem;color:rgba(255,255,255,0.5)">
-                      Focus: {", ".join(selected_focus) if selected_focus else "All areas"}
-                  </div>
-                  <div style="font-size:0.8rem;color:rgba(255,255,255,0.5);margin-top:4px">
-                      10 tailored questions · Full STAR grading
-                  </div>
-                </div>""", unsafe_allow_html=True)
+                st.markdown(preview_html(field_val, exp_level, tuple(selected_focus)),
+                            unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("---")
 
-        field_val = st.session_state.get("quick_field", "").strip()
         if not field_val:
             st.info("👆 Type your job field above or pick a role to get started.")
         else:
@@ -939,12 +911,12 @@ def page_setup():
                          use_container_width=True):
                 with st.spinner(f"Alex is preparing your {field_val} interview session…"):
                     try:
-                        focus = selected_focus if selected_focus else ["Behavioral","Technical","Situational"]
-                        plan  = build_field_plan(_api(), _prov(), _model(),
-                                                 field_val, exp_level, focus)
+                        focus = selected_focus if selected_focus else [f for f in FOCUS_OPTIONS if f in DEFAULT_FOCUS]
+                        plan  = _cached_field_plan(ss.api_key, ss.provider, ss.model,
+                                                   field_val, exp_level, tuple(focus),
+                                                   ss.plan_nonce)
                         # Clear any resume/JD so session knows we're in field mode
-                        st.session_state.resume_text = ""
-                        st.session_state.jd_text     = ""
+                        _clear_docs()
                         _launch_session(plan)
                     except Exception as e:
                         st.error(f"Couldn't build session: {e}")
@@ -955,6 +927,8 @@ def page_session():
         st.warning("No session active. Go to Setup first.")
         if st.button("Go to Setup"): _go("setup")
         return
+    if ss.provider == "ollama":
+        keep_ollama_warm(ss.api_key, ss.model)
 
     questions   = plan.get("question_pool", [])
     total_q     = len(questions)
@@ -978,8 +952,8 @@ def page_session():
           </span>
         </div>""", unsafe_allow_html=True)
     with col_h2:
-        if completed > 0:
-            avg = sum(d.get("grade",{}).get("score",0) for d in session_data) / completed
+        if ss.qa_scores:
+            avg = sum(ss.qa_scores) / len(ss.qa_scores)
             gc  = "#2d7a4f" if avg>=75 else "#d4813a" if avg>=55 else "#c0392b"
             st.markdown(f"""
             <div style="text-align:right">
@@ -1015,11 +989,10 @@ def page_session():
             if st.button("📊 Generate My Full Report", type="primary", use_container_width=True):
                 with st.spinner("Alex is writing your personalised report…"):
                     try:
-                        rpt = build_session_report(
-                            _api(), _prov(), _model(),
-                            st.session_state.session_data,
-                            st.session_state.resume_text,
-                            st.session_state.jd_text)
+                        rpt = _cached_report(
+                            ss.api_key, ss.provider, ss.model,
+                            st.session_state.session_data, *_docs(),
+                            on_delta=_stream_progress())
                         st.session_state.session_report = rpt
                         _go("report")
                     except Exception as e:
@@ -1038,7 +1011,7 @@ def page_session():
     q_cat    = q_obj.get("category","General")
     q_wgl    = q_obj.get("what_great_looks_like","")
     q_diff   = q_obj.get("difficulty","Medium")
-    diff_col = {"Easy":"#2d7a4f","Medium":"#d4813a","Hard":"#c0392b"}.get(q_diff,"#6354a5")
+    diff_col = DIFF_COLORS.get(q_diff,"#6354a5")
 
     # Previous answer's follow-up mode
     if st.session_state.followup_mode:
@@ -1052,6 +1025,7 @@ def page_session():
             else:
                 user_bubble(msg["content"])
 
+        live = st.empty()    # Alex's reply streams in here
         fu_input = st.text_input("Your response or question",
                                  placeholder="Ask a follow-up or respond to the coach…",
                                  key=f"fu_input_{idx}", label_visibility="collapsed")
@@ -1061,10 +1035,10 @@ def page_session():
                 st.session_state.followup_messages.append({"role":"user","content":fu_input})
                 with st.spinner("Alex is thinking…"):
                     try:
-                        reply = coach_followup(
-                            _api(), _prov(), _model(),
-                            st.session_state.followup_messages,
-                            st.session_state.resume_text, st.session_state.jd_text)
+                        reply = _cached_followup(
+                            ss.api_key, ss.provider, ss.model,
+                            st.session_state.followup_messages, *_docs(),
+                            on_delta=_stream_bubble(live))
                         st.session_state.followup_messages.append({"role":"assistant","content":reply})
                         st.rerun()
                     except Exception as e:
@@ -1089,11 +1063,7 @@ def page_session():
         # Grade header
         g_col1, g_col2 = st.columns([1,3], gap="large")
         with g_col1:
-            st.markdown(f"""
-            <div class="score-ring score-{grade}">
-              <div style="font-size:2rem">{score}</div>
-              <div style="font-size:1.2rem">Grade {grade}</div>
-            </div>""", unsafe_allow_html=True)
+            st.markdown(grade_ring_html(score, grade), unsafe_allow_html=True)
         with g_col2:
             st.markdown(f"""
             <div class="bubble-coach" style="margin-bottom:10px">
@@ -1192,40 +1162,22 @@ def page_session():
         return
 
     # ── Ask the question ──────────────────────────────────────────
-    st.markdown(f"""
-    <div class="q-card">
-      <div class="q-number">Q{idx+1}</div>
-      <div style="display:flex;align-items:center;gap:8px;margin-bottom:12px">
-        <span class="q-category">{q_cat}</span>
-        <span style="font-size:0.75rem;color:{diff_col};font-weight:600">{q_diff}</span>
-      </div>
-      <div class="q-text">"{q_text}"</div>
-    </div>""", unsafe_allow_html=True)
+    st.markdown(q_card_html(idx + 1, q_cat, q_diff, diff_col, q_text), unsafe_allow_html=True)
 
     # Tip section
     if st.session_state.show_tip and st.session_state.current_tip:
-        st.markdown(f"""
-        <div style="background:rgba(212,129,58,0.08);border:1px solid rgba(212,129,58,0.3);
-                    border-radius:12px;padding:14px 16px;margin-bottom:12px">
-          <div style="font-size:0.75rem;font-weight:600;color:var(--amber);
-                      text-transform:uppercase;letter-spacing:0.06em;margin-bottom:6px">
-              💡 Alex's tip
-          </div>
-          <div style="font-size:0.9rem;color:var(--ink-mid);line-height:1.6">
-              {st.session_state.current_tip}
-          </div>
-        </div>""", unsafe_allow_html=True)
+        st.markdown(tip_html(st.session_state.current_tip), unsafe_allow_html=True)
     else:
+        tip_box = st.empty()      # the tip streams in here, where it sits after the rerun
         tip_col, _ = st.columns([1,3])
         with tip_col:
             if st.button("💡 Get a Hint", use_container_width=True):
                 with st.spinner("Alex is thinking…"):
                     try:
-                        tip = get_question_tip(
-                            _api(), _prov(), _model(),
-                            q_text, q_cat,
-                            st.session_state.resume_text,
-                            st.session_state.jd_text)
+                        tip = _cached_tip(
+                            ss.api_key, ss.provider, ss.model,
+                            q_text, q_cat, *_docs(),
+                            on_delta=_stream_bubble(tip_box, render=tip_html))
                         st.session_state.current_tip = tip
                         st.session_state.show_tip = True
                         st.rerun()
@@ -1240,7 +1192,14 @@ def page_session():
             <em>What makes a great answer: {q_wgl}</em>
         </div>""", unsafe_allow_html=True)
 
-    # ── Answer input — type OR speak ────────────────────────────────
+    # ── Answer input — type OR speak ──────────────────────────────
+    _answer_input(idx, q_text, q_cat)
+
+
+@st.fragment
+def _answer_input(idx, q_text, q_cat):
+    """Answer box, voice tab and submit row. Typing or recording reruns only
+    this fragment; submit, skip and new-session trigger a full-app rerun."""
     st.markdown("""
     <div style="font-size:0.85rem;font-weight:700;color:var(--ink);
                 margin-bottom:6px;margin-top:4px">
@@ -1254,30 +1213,30 @@ def page_session():
     ans_tab, voice_tab = st.tabs(["⌨️  Type Answer", "🎙️  Record Voice"])
 
     with ans_tab:
-        typed_val = st.session_state.get("voice_transcript", "")
+        # A fresh voice transcript lands in the keyed answer box before it renders
+        if ss.voice_transcript:
+            ss[f"ans_{idx}"] = ss.voice_transcript
+            ss.voice_transcript = ""
         ans = st.text_area(
             "Answer",
-            value=typed_val,
             height=180,
             label_visibility="collapsed",
             placeholder="Type your answer here. Aim for 2-4 minutes of speaking. "
                         "Be specific — real examples beat generic statements every time.",
             key=f"ans_{idx}",
         )
-        if typed_val and ans:
-            st.session_state.voice_transcript = ""
 
     with voice_tab:
-        provider_ok = _prov() in ("groq", "openai", "ollama")
+        provider_ok = ss.provider in ("groq", "openai", "ollama")
         if not provider_ok:
             st.warning(
                 f"Voice recording needs Groq (free), OpenAI, or Ollama. "
-                f"Your current provider ({_prov()}) doesn't support audio transcription. "
+                f"Your current provider ({ss.provider}) doesn't support audio transcription. "
                 "Switch to Groq for instant free transcription."
             )
         else:
             provider_label = {"groq": "Groq Whisper (free)", "openai": "OpenAI Whisper",
-                              "ollama": "Local Whisper"}.get(_prov(), _prov())
+                              "ollama": "Local Whisper"}.get(ss.provider, ss.provider)
 
             st.markdown(f"""
             <div style="font-size:0.82rem;color:var(--ink-lt);margin-bottom:12px;
@@ -1297,6 +1256,15 @@ def page_session():
             )
 
             if audio_input is not None:
+                # Transcription starts as soon as a new recording lands; the
+                # button below only collects the result. Each rerun hands back
+                # a fresh UploadedFile, so the worker owns this one outright.
+                job_key = f"_stt_{idx}"
+                job = ss.get(job_key)
+                if job is None or job[0] != audio_input.file_id:
+                    job = ss[job_key] = (audio_input.file_id, transcribe_in_background(
+                        audio_input, ss.api_key, ss.provider))
+
                 # Show a success indicator
                 st.markdown("""
                 <div style="padding:8px 12px;border-radius:8px;margin-top:6px;
@@ -1323,16 +1291,16 @@ def page_session():
 
                 if do_transcribe:
                     try:
-                        audio_bytes = audio_input.read()
                         with st.spinner("🎙️ Transcribing your answer with Whisper…"):
-                            transcript = transcribe_audio(audio_bytes, _api(), _prov())
+                            transcript = job[1].result()
                         if transcript and transcript.strip():
                             st.session_state.voice_transcript = transcript.strip()
                             st.success("✅ Done! Switch to the Type tab — your answer is ready to submit.")
-                            st.rerun()
+                            st.rerun(scope="fragment")
                         else:
                             st.error("Transcription returned empty — please try recording again.")
                     except Exception as e:
+                        ss.pop(job_key, None)      # the next run starts a fresh attempt
                         st.error(f"Transcription failed: {e}")
             else:
                 st.markdown("""
@@ -1343,9 +1311,7 @@ def page_session():
                 </div>""", unsafe_allow_html=True)
 
     # ── Final answer text ─────────────────────────────────────────
-    final_ans = ans.strip() if ans.strip() else ""
-
-
+    final_ans = ans.strip()
 
     a1, a2, a3 = st.columns([3,1,1])
     with a1:
@@ -1367,13 +1333,16 @@ def page_session():
     if submit and final_ans:
         with st.spinner("Alex is reviewing your answer…"):
             try:
-                grade = grade_answer(
-                    _api(), _prov(), _model(),
-                    q_text, final_ans, q_cat,
-                    st.session_state.resume_text, st.session_state.jd_text)
+                grade = _cached_grade(
+                    ss.api_key, ss.provider, ss.model,
+                    q_text, final_ans, q_cat, *_docs(),
+                    on_delta=_stream_grade())
                 entry = {"question": q_text, "category": q_cat,
-                         "answer": final_ans, "grade": grade}
+                         "answer": final_ans, "grade": grade,
+                         # report-view truncations, cut once here instead of per rerun
+                         "_q55": q_text[:55], "_a400": final_ans[:400]}
                 st.session_state.session_data.append(entry)
+                st.session_state.qa_scores.append(int(grade.get("score", 0)))
                 st.session_state.last_grade = grade
                 st.session_state.show_tip   = False
                 st.session_state.voice_transcript = ""
@@ -1388,8 +1357,7 @@ def page_session():
 def page_report():
     st.markdown('<div class="section-head">📊 Your Coaching Report</div>', unsafe_allow_html=True)
 
-    rpt = st.session_state.session_report
-    data = st.session_state.session_data
+    rpt, data = ss.session_report, ss.session_data
 
     if not data:
         st.info("No session data yet. Complete a practice session first.")
@@ -1399,15 +1367,16 @@ def page_report():
     # Quick summary if no full report yet
     if not rpt:
         st.markdown("**Session Summary** (full AI report not yet generated)")
-        avg = sum(d.get("grade",{}).get("score",0) for d in data) / len(data)
+        scores = ss.qa_scores or [d.get("grade",{}).get("score",0) for d in data]
+        avg = sum(scores) / len(scores)
         st.metric("Session Average", f"{avg:.0f}/100")
         if st.button("📊 Generate Full Report", type="primary"):
             with st.spinner("Alex is writing your report…"):
                 try:
-                    rpt = build_session_report(
-                        _api(), _prov(), _model(),
-                        data, st.session_state.resume_text, st.session_state.jd_text)
-                    st.session_state.session_report = rpt
+                    rpt = _cached_report(
+                        ss.api_key, ss.provider, ss.model,
+                        data, *_docs(), on_delta=_stream_progress())
+                    ss.session_report = rpt
                     st.rerun()
                 except Exception as e:
                     st.error(f"Report failed: {e}")
@@ -1421,54 +1390,36 @@ def page_report():
     gc       = GRADE_COLORS.get(grade,"#d4813a")
 
     # Hero
-    st.markdown(f"""
-    <div style="background:linear-gradient(135deg,{gc}18,{gc}06);border:2px solid {gc}40;
-                border-radius:20px;padding:28px;text-align:center;margin-bottom:24px">
-      <div style="font-size:4.5rem;font-weight:900;color:{gc};
-                  font-family:'Playfair Display',serif;line-height:1">{overall}</div>
-      <div style="font-size:2rem;font-weight:800;color:{gc}">Grade {grade}</div>
-      <div style="color:{gc};font-size:1rem;font-weight:600;margin-top:4px">{tier}</div>
-      <div style="color:var(--ink-mid);font-size:0.95rem;margin-top:10px;
-                  font-style:italic">"{headline}"</div>
-    </div>""", unsafe_allow_html=True)
+    st.markdown(hero_html(overall, grade, tier, headline, gc), unsafe_allow_html=True)
 
     # Category scores
     cat_scores = rpt.get("category_scores",{})
     if cat_scores:
         st.markdown("#### Category Breakdown")
-        c1, c2 = st.columns(2)
         items = list(cat_scores.items())
-        for i, (cat, sc) in enumerate(items):
-            with (c1 if i % 2 == 0 else c2):
-                rpt_bar(cat, sc)
+        # Alternate bars between the two columns, one markdown call per column
+        for col, half in zip(st.columns(2), (items[0::2], items[1::2])):
+            col.markdown("".join(rpt_bar_html(cat, sc) for cat, sc in half),
+                         unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
 
     # Strengths & improvements
     sr_col, im_col = st.columns(2, gap="large")
     with sr_col:
         st.markdown("#### 🌟 Top Strengths")
-        for s in rpt.get("top_strengths",[]):
-            st.markdown(f'<div class="fb-green">{s}</div>', unsafe_allow_html=True)
+        st.markdown("".join(f'<div class="fb-green">{s}</div>'
+                            for s in rpt.get("top_strengths",[])), unsafe_allow_html=True)
     with im_col:
         st.markdown("#### ⚡ Priority Improvements")
         for p in rpt.get("priority_improvements",[]):
             with st.expander(f"📌 {p.get('area','')}"):
-                st.markdown(f"**Issue:** {p.get('issue','')}")
-                st.markdown(f"**Fix:** {p.get('fix','')}")
+                st.markdown(f"**Issue:** {p.get('issue','')}\n\n**Fix:** {p.get('fix','')}")
 
     # Action plan
     ap = rpt.get("action_plan",[])
     if ap:
         st.markdown("#### 🗓️ Your Action Plan")
-        for i, item in enumerate(ap, 1):
-            st.markdown(f"""
-            <div style="display:flex;gap:12px;align-items:flex-start;margin-bottom:8px">
-              <div style="background:var(--teal);color:white;border-radius:50%;
-                          width:24px;height:24px;min-width:24px;display:flex;
-                          align-items:center;justify-content:center;font-size:0.75rem;
-                          font-weight:700">{i}</div>
-              <div style="color:var(--ink-mid);font-size:0.9rem;line-height:1.5">{item}</div>
-            </div>""", unsafe_allow_html=True)
+        st.markdown(action_plan_html(tuple(map(str, ap))), unsafe_allow_html=True)
 
     # Personal note from coach
     note = rpt.get("personal_note","")
@@ -1483,59 +1434,60 @@ def page_report():
         g   = item.get("grade",{})
         sc  = g.get("score",0)
         gr  = g.get("grade","C")
-        gcc = GRADE_COLORS.get(gr,"#d4813a")
         with st.expander(f"Q{i} [{item.get('category','')}] — {sc}/100 (Grade {gr}) "
-                         f"· {item.get('question','')[:55]}…"):
+                         f"· {item.get('_q55') or item.get('question','')[:55]}…"):
             st.markdown(f"**Question:** {item.get('question','')}")
-            st.markdown(f"**Your Answer:** {item.get('answer','')[:400]}…")
-            st.markdown(f"**Coach's Take:** {g.get('coach_reaction','')}")
+            st.caption("Your Answer")
+            st.text(f"{item.get('_a400') or item.get('answer','')[:400]}…")
+            st.caption("Coach's Take")
+            st.text(g.get("coach_reaction", ""))
             if g.get("model_answer"):
-                st.markdown(f'<div class="fb-model">'
-                            f'<b>Model Answer:</b> {g["model_answer"]}</div>',
+                st.markdown(MODEL_ANSWER_TMPL.format(text=g["model_answer"]),
                             unsafe_allow_html=True)
 
     # Download
     st.markdown("<br>", unsafe_allow_html=True)
-    lines = [
-        "INTERVIEW COACHING REPORT — Coach Alex AI",
-        "="*50,
-        f"Overall Score: {overall}/100 · Grade {grade} · {tier}",
-        f'"{headline}"', "",
-    ]
-    for i, item in enumerate(data,1):
-        g = item.get("grade",{})
-        lines += [f"\nQ{i}: {item.get('question','')}",
-                  f"Score: {g.get('score',0)}/100 ({g.get('grade','')})",
-                  f"Your Answer: {item.get('answer','')}",
-                  f"Coach: {g.get('coach_reaction','')}",
-                  f"Model Answer: {g.get('model_answer','')}","─"*50]
-    if ap:
-        lines += ["\nACTION PLAN:"] + [f"{i}. {a}" for i,a in enumerate(ap,1)]
-    if note:
-        lines += ["\nCOACH'S NOTE:", note]
-
     st.download_button("📄 Download Full Report (TXT)",
-                       "\n".join(lines).encode(), "coaching_report.txt", "text/plain",
+                       _report_download(rpt, data), "coaching_report.txt", "text/plain",
                        use_container_width=True)
 
 
 # ══════════════════════════════════════════════════════════════════
 # PAGE: FREE CHAT
 # ══════════════════════════════════════════════════════════════════
+def _send_chat(text, live):
+    """Append the user's message, stream Alex's reply into `live`, then rerun."""
+    msgs = ss.chat_messages
+    msgs.append({"role":"user","content":text})
+    live.markdown(user_bubble_html(text), unsafe_allow_html=True)
+    box = live.empty()
+    with st.spinner("Alex is thinking…"):
+        try:
+            reply = free_chat(ss.api_key, ss.provider, ss.model, msgs,
+                              ss.resume_text, ss.jd_text,
+                              on_delta=_stream_bubble(box))
+            msgs.append({"role":"assistant","content":reply})
+        except Exception as e:
+            st.error(f"Chat error: {e}")
+    st.rerun()
+
+
 def page_chat():
     st.markdown('<div class="section-head">💬 Chat with Coach Alex</div>', unsafe_allow_html=True)
     st.markdown('<div class="section-sub">Ask anything — interview nerves, salary negotiation, '
                 'career pivots, how to position yourself. Alex is here for you.</div>',
                 unsafe_allow_html=True)
 
-    if not _ready():
+    if not ss.connected:
         st.warning("⚠️ Connect your AI provider in the sidebar first.")
         return
+    if ss.provider == "ollama":
+        keep_ollama_warm(ss.api_key, ss.model)
 
-    msgs = st.session_state.chat_messages
+    msgs = ss.chat_messages
 
     if not msgs:
-        has_ctx = _has_context()
+        has_ctx = bool(ss.resume_hash or ss.jd_hash)
         ctx_note = ("I can see your resume and the job you're targeting — so my advice will be "
                     "tailored to you.") if has_ctx else \
                    ("You haven't added a resume or job description yet — I'll give general advice. "
@@ -1547,11 +1499,14 @@ def page_chat():
             "what they're really looking for, salary negotiation… anything."
         )
     else:
+        # One element per bubble: message text goes in unescaped, so stray
+        # markup in one message can't swallow the bubbles after it
         for msg in msgs:
             if msg["role"] == "user":
                 user_bubble(msg["content"])
             else:
                 coach_bubble(msg["content"])
+    live = st.container()    # the exchange being streamed lands under the history
 
     # Quick starters
     starters = [
@@ -1562,22 +1517,12 @@ def page_chat():
         "What questions should I ask the interviewer?",
         "How do I explain a gap in my employment?",
     ]
-    with st.expander("💡 Quick starters — tap to send"):
-        cols = st.columns(2)
-        for i, s in enumerate(starters):
-            with cols[i % 2]:
-                if st.button(s, key=f"starter_{i}", use_container_width=True):
-                    st.session_state.chat_messages.append({"role":"user","content":s})
-                    with st.spinner("Alex is thinking…"):
-                        try:
-                            reply = free_chat(_api(), _prov(), _model(),
-                                             st.session_state.chat_messages,
-                                             st.session_state.resume_text,
-                                             st.session_state.jd_text)
-                            st.session_state.chat_messages.append({"role":"assistant","content":reply})
-                        except Exception as e:
-                            st.error(f"Chat error: {e}")
-                    st.rerun()
+    with st.expander("💡 Quick starters — pick one to send"):
+        # One form, one submit: choosing a starter doesn't rerun the page
+        with st.form("starters_form", clear_on_submit=True, border=False):
+            choice = st.radio("Starter", starters, label_visibility="collapsed")
+            if st.form_submit_button("Send starter", use_container_width=True):
+                _send_chat(choice, live)
 
     st.markdown("---")
     user_in = st.text_input("Your message", placeholder="Ask Alex anything…",
@@ -1591,17 +1536,7 @@ def page_chat():
             st.rerun()
 
     if send and user_in.strip():
-        st.session_state.chat_messages.append({"role":"user","content":user_in})
-        with st.spinner("Alex is thinking…"):
-            try:
-                reply = free_chat(_api(), _prov(), _model(),
-                                  st.session_state.chat_messages,
-                                  st.session_state.resume_text,
-                                  st.session_state.jd_text)
-                st.session_state.chat_messages.append({"role":"assistant","content":reply})
-            except Exception as e:
-                st.error(f"Chat error: {e}")
-        st.rerun()
+        _send_chat(user_in, live)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -10,7 +10,21 @@ Key change in v4:
   the pattern, not just memorises the answer.
 """
 from __future__ import annotations
-import json, re, time
+import hashlib, io, json, os, random, re, tempfile, threading, time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
+from .providers import HELP_LINKS, PROVIDER_MODELS  # re-exported for callers
+
+try:
+    import simdjson as _simdjson   # optional (pip install pysimdjson): faster large replies
+except ImportError:
+    _simdjson = None
+try:
+    import json_repair as _json_repair   # optional: rescues replies the scanner can't
+except ImportError:
+    _json_repair = None
 
 
 # ── Token budgets ─────────────────────────────────────────────────
@@ -19,6 +33,7 @@ _JD_LIMIT      = 2000
 _CHAT_TOKENS   = 900
 _GRADE_TOKENS  = 1400   # raised — human model answers need more room
 _PLAN_TOKENS   = 1000
+_PROFILE_TOKENS = 400   # candidate profile half of a split session plan
 _TIPS_TOKENS   = 500
 _REPORT_TOKENS = 1400
 
@@ -45,199 +60,467 @@ def _trim(text: str, limit: int) -> str:
     return text[:limit] + "\n[truncated]" if len(text) > limit else text
 
 
-def _ollama_trim(text: str, task: str) -> str:
-    if not text or not text.strip():
+_CHARS_PER_TOKEN = 4   # _OLLAMA_CTX is in chars; token budgets are derived from it
+
+# Ollama runs every model in a fixed window (num_ctx; 4096 unless the server
+# sets OLLAMA_CONTEXT_LENGTH) and silently drops the start of a prompt that
+# does not fit, which with the documents first is the resume. The documents
+# get whatever the window leaves after the rest of the prompt and the reply.
+try:
+    _OLLAMA_NUM_CTX = int(os.environ.get("OLLAMA_CONTEXT_LENGTH") or 4096)
+except ValueError:
+    _OLLAMA_NUM_CTX = 4096
+_PROMPT_SLACK = 200    # chars of section labels and joins not counted by callers
+
+
+def _ollama_doc_limit(task: str, fixed: int) -> int:
+    """Per-document char limit for task: its _OLLAMA_CTX limit, lowered so two
+    documents still fit beside `fixed` chars of other prompt and the reply."""
+    room = (_OLLAMA_NUM_CTX - _OLLAMA_TOKENS.get(task, 500)) * _CHARS_PER_TOKEN
+    room -= fixed + _PROMPT_SLACK
+    return max(0, min(_OLLAMA_CTX.get(task, 400), room // 2))
+
+
+_CL100K_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+
+
+def _cl100k_cached() -> bool:
+    """Whether tiktoken's cl100k vocab is already on disk. tiktoken downloads
+    it on first use, which would stall an offline Ollama prompt until the
+    HTTP timeout. Mirrors tiktoken's own cache location."""
+    cache_dir = (os.environ.get("TIKTOKEN_CACHE_DIR") or os.environ.get("DATA_GYM_CACHE_DIR")
+                 or os.path.join(tempfile.gettempdir(), "data-gym-cache"))
+    return os.path.isfile(os.path.join(cache_dir, hashlib.sha1(_CL100K_URL.encode()).hexdigest()))
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    """cl100k tokenizer if tiktoken is installed and its vocab is already
+    cached locally, else None (character trimming)."""
+    if not _cl100k_cached():
+        return None
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=8)
+def _token_ids(text: str) -> tuple:
+    """Token ids of a document. Every call in a session trims the same resume
+    and JD, so each is encoded once rather than per call."""
+    return tuple(_encoder().encode(text))
+
+
+def _ollama_trim(text: str, task: str, fixed: int = 0) -> str:
+    """
+    Head and tail of text within the task's budget for a local model, with
+    `fixed` chars of other prompt to leave room for (see _ollama_doc_limit).
+    With tiktoken the budget is counted in tokens, which is what prefill
+    actually costs, so dense text (code, tables) is not under-trimmed and
+    plain prose is not over-trimmed; otherwise it falls back to the
+    character limit.
+    """
+    limit = _ollama_doc_limit(task, fixed)
+    if not text or not text.strip() or limit < _CHARS_PER_TOKEN * 2:
         return ""
-    limit = _OLLAMA_CTX.get(task, 400)
+    enc   = _encoder() if len(text) > limit // _CHARS_PER_TOKEN else None
+    if enc is not None:
+        budget = limit // _CHARS_PER_TOKEN
+        ids = _token_ids(text)
+        if len(ids) <= budget:
+            return text
+        half = budget // 2
+        return enc.decode(list(ids[:half])) + "\n[...]\n" + enc.decode(list(ids[-half:]))
     if len(text) <= limit:
         return text
     half = limit // 2
     return text[:half] + "\n[...]\n" + text[-half:]
 
 
+@lru_cache(maxsize=32)
 def _brevity(provider: str, words: int = 50) -> str:
     return (f"\nIMPORTANT: Keep every field under {words} words. Be concise."
             if provider == "ollama" else "")
 
 
 # ── Robust JSON extractor ─────────────────────────────────────────
+_FENCE_RE     = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+_JSON_SIG_RE  = re.compile(r'[\\"{}\[\]]')   # the only characters the scanner acts on
+_JSON_OPEN_RE = re.compile(r"[{\[]")
+_DEC          = json.JSONDecoder()
+
+
+_SIMD_MIN   = 512              # below this json.loads is as fast
+_simd_local = threading.local()  # simdjson parsers are not thread-safe
+
+
+def _loads(doc: str):
+    """json.loads, through simdjson for larger documents when it is installed."""
+    if _simdjson is None or len(doc) < _SIMD_MIN:
+        return json.loads(doc)
+    parser = getattr(_simd_local, "parser", None)
+    if parser is None:
+        parser = _simd_local.parser = _simdjson.Parser()
+    try:
+        return parser.parse(doc.encode(), recursive=True)
+    except ValueError:
+        return json.loads(doc)     # invalid: let json raise its usual error
+
+
+def _parse(doc: str):
+    """_loads, falling back to json_repair (when installed) for a document that
+    is balanced but still invalid: trailing commas, single quotes, comments."""
+    try:
+        return _loads(doc)
+    except ValueError:
+        if _json_repair is None:
+            raise
+        fixed = _json_repair.loads(doc)
+        if not isinstance(fixed, (dict, list)):
+            raise
+        return fixed
+
+
 def _ej(text: str):
-    if not text or not text.strip():
+    """
+    Parse the first JSON object or array in a model reply. One pass finds the
+    matching close; if the reply was cut off first, the scanner's own state
+    (open string, stack of open containers) is used to close it off, innermost
+    first, so the text is never rescanned for repair. The scan hops between
+    structural characters via _JSON_SIG_RE rather than stepping through
+    every character in Python. Before that, raw_decode tries the document
+    in C from its first bracket, which settles any well-formed reply that is
+    merely wrapped in prose.
+    """
+    stripped = (text or "").strip()
+    if not stripped:
         raise ValueError("Empty response from model.")
-    text = text.replace("\u201c", '"').replace("\u201d", '"')
-    text = text.replace("\u2018", "'").replace("\u2019", "'")
-    fence = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
-    if fence:
-        text = fence.group(1).strip()
-    s_obj, s_arr = text.find("{"), text.find("[")
-    if s_obj == -1 and s_arr == -1:
-        raise ValueError(f"No JSON in response. Got: {text[:300]}")
-    if s_arr == -1 or (s_obj != -1 and s_obj < s_arr):
-        start, oc, cc = s_obj, "{", "}"
-    else:
-        start, oc, cc = s_arr, "[", "]"
-    depth = 0; in_str = False; esc = False
-    for i, ch in enumerate(text[start:], start=start):
-        if esc:                   esc = False;  continue
-        if ch == "\\" and in_str: esc = True;   continue
-        if ch == '"':             in_str = not in_str; continue
-        if in_str:                continue
-        if ch == oc:              depth += 1
-        elif ch == cc:
-            depth -= 1
-            if depth == 0:
-                try:    return json.loads(text[start:i+1])
-                except: return json.loads(_repair_json(text[start:i+1]))
-    candidate = text[start:]
-    try:    return json.loads(candidate)
-    except: return json.loads(_repair_json(candidate))
-
-
-def _repair_json(s: str) -> str:
-    depth_brace = 0; depth_bracket = 0
-    in_str = False; esc = False
-    for ch in s:
-        if esc:           esc = False; continue
-        if ch == "\\":    esc = True;  continue
-        if ch == '"':     in_str = not in_str; continue
-        if in_str:        continue
-        if ch == "{":     depth_brace   += 1
-        elif ch == "}":   depth_brace   -= 1
-        elif ch == "[":   depth_bracket += 1
-        elif ch == "]":   depth_bracket -= 1
-    if in_str:            s += '"'
-    s = re.sub(r",\s*$", "", s.rstrip())
-    s += "]" * max(0, depth_bracket)
-    s += "}" * max(0, depth_brace)
-    return s
+    if stripped[0] in "{[":
+        # JSON-mode replies are already a bare document: no scan needed
+        try:
+            return _loads(stripped)
+        except ValueError:
+            pass
+    text  = text.translate(_SMART_QUOTES)
+    fence = _FENCE_RE.search(text)
+    lo, hi = fence.span(1) if fence else (0, len(text))   # scanned in place, not sliced
+
+    first = _JSON_OPEN_RE.search(text, lo, hi)        # nothing counts before the first { or [
+    if first is None:
+        raise ValueError(f"No JSON in response. Got: {text[lo:hi].strip()[:300]}")
+    start = first.start()
+    try:
+        doc, end = _DEC.raw_decode(text, start)
+        if end <= hi:
+            return doc
+    except ValueError:
+        pass
+
+    closers = ["}" if text[start] == "{" else "]"]; in_str = False; skip = -1
+    for m in _JSON_SIG_RE.finditer(text, start + 1, hi):
+        i, ch = m.start(), m.group()
+        if i < skip:              continue        # the character after a backslash
+        if in_str:
+            if ch == "\\":        skip = i + 2
+            elif ch == '"':       in_str = False
+            continue
+        if ch == '"':             in_str = True
+        elif ch == "{":           closers.append("}")
+        elif ch == "[":           closers.append("]")
+        elif ch != "\\":
+            closers.pop()
+            if not closers:       return _parse(text[start:i+1])
+
+    # Truncated reply: finish the open string, or else drop trailing whitespace
+    # and a dangling comma, then close the rest. One slice, built once.
+    if in_str:
+        return _parse(text[start:hi] + '"' + "".join(reversed(closers)))
+    while hi > start and text[hi - 1] in " \t\r\n,":
+        hi -= 1
+    return _parse(text[start:hi] + "".join(reversed(closers)))
+
+
+def partial_json(text: str):
+    """Best-effort parse of a JSON object still streaming in: the fields that
+    have arrived (the last possibly cut short), or None if nothing parses yet."""
+    try:
+        doc = _ej(text)
+    except ValueError:
+        return None
+    return doc if isinstance(doc, dict) else None
+
+
+_RETRY_BASE = 0.3    # seconds; attempt n waits up to _RETRY_BASE * 2**(n-1)
+_RETRY_CAP  = 20.0   # longest Retry-After we are willing to honour
+
+
+def _retry_delay(err: Exception, attempt: int):
+    """
+    Seconds to wait before retrying after err, or None when retrying cannot
+    help (a 4xx such as bad request or auth failure; 408/409/429 excepted).
+    A server-sent Retry-After wins; otherwise exponential backoff with full
+    jitter, so clients hitting the same rate limit don't retry in lockstep.
+    Works on both SDKs' API errors and requests' HTTPError by duck-typing
+    status_code/response.
+    """
+    status = (getattr(err, "status_code", None)
+              or getattr(getattr(err, "response", None), "status_code", None))
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 409, 429):
+        return None
+    headers = getattr(getattr(err, "response", None), "headers", None) or {}
+    try:
+        return min(float(headers.get("retry-after")), _RETRY_CAP)
+    except (TypeError, ValueError):
+        return random.uniform(0, _RETRY_BASE * 2 ** (attempt - 1))
 
 
 def _call_with_retry(api_key, provider, model, prompt, system_prompt,
-                     temperature, max_tokens, retries=3) -> str:
-    last_err = None
+                     temperature, max_tokens, retries=3, on_delta=None,
+                     json_mode=False) -> str:
+    # json_mode already constrains the output, so a retry resends the identical
+    # prompt (and keeps any provider-side prefix cache); without it the retry
+    # appends a reminder to answer in JSON. Once a streamed attempt has passed
+    # text to on_delta the caller is showing it, so a failure after that is
+    # raised rather than retried into the same buffer.
+    last_err, emitted = None, [False]
+    if on_delta is not None:
+        sink = on_delta
+        def on_delta(chunk):
+            emitted[0] = True
+            sink(chunk)
     for attempt in range(1, retries + 1):
         try:
-            p = prompt if attempt == 1 else (
+            p = prompt if attempt == 1 or json_mode else (
                 prompt + f"\n\n[Attempt {attempt}: output ONLY valid JSON "
                 "starting with {{ or [. No other text.]"
             )
             return call_llm(api_key, provider, model, p,
                             system_prompt=system_prompt,
                             temperature=max(0.1, temperature - 0.05 * (attempt-1)),
-                            max_tokens=max_tokens)
+                            max_tokens=max_tokens, on_delta=on_delta,
+                            json_mode=json_mode)
         except Exception as e:
             last_err = e
+            delay = None if emitted[0] else _retry_delay(e, attempt)
+            if delay is None:
+                break
             if attempt < retries:
-                time.sleep(0.3)
+                time.sleep(delay)
     raise last_err
 
 
 # ── Ollama URL helpers ────────────────────────────────────────────
+_OLLAMA_SCHEME_RE = re.compile(r"https?://", re.I)
+_OLLAMA_SUFFIX_RE = re.compile(r"(?:/v1/chat/completions|/api/v1|/v1|/api)?/*$")
+
+
+@lru_cache(maxsize=32)
 def _ollama_root(raw: str) -> str:
-    url = (raw or "").strip().rstrip("/")
-    if not url:
-        url = "http://localhost:11434"
-    if not url.startswith("http"):
+    """Server root from whatever the user pasted: bare host, OpenAI-style /v1
+    base, a full endpoint, with or without scheme or trailing slash."""
+    url = (raw or "").strip() or "http://localhost:11434"
+    if not _OLLAMA_SCHEME_RE.match(url):
         url = "http://" + url
-    for suffix in ["/v1/chat/completions", "/v1", "/api/v1", "/api"]:
-        if url.endswith(suffix):
-            url = url[: -len(suffix)]
-    return url
+    return _OLLAMA_SUFFIX_RE.sub("", url, count=1)
+
+
+def _keep_alive(raw: str):
+    """Ollama takes a duration string ("30m") or a number of seconds (-1 = never unload)."""
+    return int(raw) if raw.lstrip("-").isdigit() else raw
+
+
+# Sent with every Ollama request so the model stays loaded between questions
+# rather than falling back to the server's 5-minute default mid-session.
+_OLLAMA_KEEP_ALIVE = _keep_alive(os.environ.get("OLLAMA_KEEP_ALIVE", "30m"))
+
+
+# Tags, warm-up and connection probes share one keep-alive session, so the
+# chatty control-plane calls reuse a socket instead of reconnecting each time.
+# Built under a lock: the warm-up thread is often its first user, racing the
+# script thread's tags probe, and two sessions would mean two pools.
+_HTTP = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _http():
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _HTTP = session
+    return _HTTP
+
+
+def _http_get_json(url: str, timeout: float):
+    r = _http().get(url, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
 
 
-def _ollama_base(raw: str) -> str:
-    return _ollama_root(raw) + "/v1"
+def _http_post_json(url: str, payload: dict, timeout: float):
+    r = _http().post(url, json=payload, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
 
 
-def _ollama_warmup(api_key: str, model: str) -> None:
+# /api/tags payload per server root. verify_connection always refetches and
+# refreshes the entry, so the model list read right after Connect is a hit.
+_TAGS_TTL = 5.0
+_TAGS_CACHE: dict = {}
+
+
+def _ollama_tags(root: str, timeout: float, fresh: bool = False) -> dict:
+    hit = _TAGS_CACHE.get(root)
+    if hit and not fresh and hit[0] > time.monotonic():
+        return hit[1]
+    data = _http_get_json(f"{root}/api/tags", timeout=timeout)
+    _TAGS_CACHE[root] = (time.monotonic() + _TAGS_TTL, data)
+    return data
+
+
+# Warm-ups are fire-and-forget: the useful effect is the server loading the
+# model, so the caller never waits on it. One in flight per (server, model).
+# The timeout is generous on purpose, since Ollama abandons a load whose
+# request is dropped.
+# A model warmed in the last _WARM_FOR seconds is still loaded (keep_alive
+# is longer), so a repeat warm-up is skipped.
+_WARM_FOR = 300
+_WARMED: dict = {}            # (root, model) -> monotonic time of last warm-up or chat call
+_WARMUP_INFLIGHT: set = set()
+_WARMUP_LOCK = threading.Lock()
+
+
+def keep_ollama_warm(api_key: str, model: str) -> None:
+    """Load the model in the background unless it was warmed or used in the
+    last _WARM_FOR seconds. The UI calls this on pages about to need it."""
+    key = (_ollama_root(api_key), model)
+    with _WARMUP_LOCK:
+        if key in _WARMUP_INFLIGHT or time.monotonic() - _WARMED.get(key, -_WARM_FOR) < _WARM_FOR:
+            return
+        _WARMUP_INFLIGHT.add(key)
+    threading.Thread(target=_warmup_worker, args=key, daemon=True).start()
+
+
+def _warmup_worker(root: str, model: str) -> None:
     try:
-        import urllib.request as _ur
-        root    = _ollama_root(api_key)
-        payload = json.dumps({"model": model, "prompt": "", "keep_alive": "10m"}).encode()
-        req = _ur.Request(f"{root}/api/generate", data=payload,
-                          headers={"Content-Type": "application/json"}, method="POST")
-        _ur.urlopen(req, timeout=4)
+        _http_post_json(f"{root}/api/generate",
+                        {"model": model, "prompt": "", "keep_alive": _OLLAMA_KEEP_ALIVE,
+                         "stream": False},
+                        timeout=120)
+        _WARMED[(root, model)] = time.monotonic()
     except Exception:
         pass
+    finally:
+        with _WARMUP_LOCK:
+            _WARMUP_INFLIGHT.discard((root, model))
+
+
+# Offered before the server can be reached. The explicit quantisation tags
+# make the trade-off visible: on CPU, Q4 generates roughly twice as fast as
+# Q8 (half the weight bytes to stream per token) at a small cost in quality.
+_OLLAMA_SUGGESTED = {
+    "llama3.2 (default)":             "llama3.2",
+    "Llama 3.2 3B · Q4_0 — fastest":  "llama3.2:3b-instruct-q4_0",
+    "Llama 3.2 3B · Q8_0 — quality":  "llama3.2:3b-instruct-q8_0",
+    "llama3.1":                       "llama3.1",
+    "Llama 3.1 8B · Q8_0 — quality":  "llama3.1:8b-instruct-q8_0",
+    "Phi 3.5 Mini · Q4_K_M":          "phi3.5:3.8b-mini-instruct-q4_K_M",
+    "mistral":                        "mistral",
+    "phi3":                           "phi3",
+}
+
+
+def _model_label(m: dict) -> str:
+    """Installed model name with its size and quantisation from /api/tags."""
+    d    = m.get("details") or {}
+    spec = " ".join(v for v in (d.get("parameter_size"), d.get("quantization_level")) if v)
+    return f"{m['name']} · {spec}" if spec else m["name"]
 
 
 def get_ollama_models(api_key: str) -> dict:
     try:
-        import urllib.request as _ur, json as _json
-        root = _ollama_root(api_key)
-        req  = _ur.urlopen(f"{root}/api/tags", timeout=4)
-        data = _json.loads(req.read())
-        installed = [m["name"] for m in data.get("models", [])]
+        data = _ollama_tags(_ollama_root(api_key), timeout=4)
+        installed = {_model_label(m): m["name"] for m in data.get("models", [])}
         if not installed:
             return {"(no models found — run: ollama pull phi3.5)": "phi3.5"}
-        return {name: name for name in installed}
+        return installed
     except Exception:
-        return {
-            "llama3.2 (default)": "llama3.2",
-            "llama3.1":           "llama3.1",
-            "mistral":            "mistral",
-            "phi3":               "phi3",
-        }
-
-
-# ── Provider model catalogue ──────────────────────────────────────
-PROVIDER_MODELS = {
-    "groq": {
-        "Llama 3.3 70B — Recommended (FREE)": "llama-3.3-70b-versatile",
-        "Llama 3.1 8B — Fastest (FREE)":      "llama-3.1-8b-instant",
-        "Mixtral 8x7B (FREE)":                 "mixtral-8x7b-32768",
-    },
-    "openai": {
-        "GPT-4o Mini — Budget": "gpt-4o-mini",
-        "GPT-4o — Best":        "gpt-4o",
-        "GPT-3.5 Turbo":        "gpt-3.5-turbo",
-    },
-    "anthropic": {
-        "Claude 3 Haiku — Cheapest": "claude-3-haiku-20240307",
-        "Claude 3.5 Sonnet":         "claude-3-5-sonnet-20241022",
-    },
-    "openrouter": {
-        "Llama 3.3 70B (Free tier)": "meta-llama/llama-3.3-70b-instruct",
-        "Mistral 7B (Budget)":       "mistralai/mistral-7b-instruct",
-        "GPT-4o Mini":               "openai/gpt-4o-mini",
-    },
-    "ollama": {
-        "⚡ Connect first to see your installed models": "llama3.2",
-    },
-}
-
-HELP_LINKS = {
-    "groq":       "https://console.groq.com/keys",
-    "openai":     "https://platform.openai.com/api-keys",
-    "anthropic":  "https://console.anthropic.com/settings/keys",
-    "openrouter": "https://openrouter.ai/keys",
-    "ollama":     "https://ollama.ai/download",
-}
+        return dict(_OLLAMA_SUGGESTED)
 
 
 # ── Client factory ────────────────────────────────────────────────
+# One client per (provider, key) for the life of the process, so calls reuse
+# the SDK's HTTP connection pool instead of a fresh TLS handshake each time.
+# Keyed by a digest so the table itself never holds raw API keys.
+_CLIENTS: dict = {}
+# httpx drops idle connections after 5s by default, well inside the time it
+# takes to type an answer; keep them long enough to span a question.
+_KEEPALIVE_S = 300
+
+
+def _key_digest(api_key: str) -> str:
+    """Short digest standing in for an API key in the tables keyed per key."""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
 def get_client(api_key: str, provider: str):
-    from openai import OpenAI
+    slot = (provider, _key_digest(api_key))
+    client = _CLIENTS.get(slot)
+    if client is None:
+        client = _CLIENTS[slot] = _new_client(api_key, provider)
+    return client
+
+
+def _pooled_http(sdk):
+    """The SDK's default httpx client with a longer idle keep-alive, or None
+    (the SDK's own default) if httpx can't be imported directly."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return sdk.DefaultHttpxClient(limits=httpx.Limits(
+        max_connections=40, max_keepalive_connections=20, keepalive_expiry=_KEEPALIVE_S))
+
+
+def _new_client(api_key: str, provider: str):
     if provider == "anthropic":
         import anthropic
-        return anthropic.Anthropic(api_key=api_key)
-    if provider == "ollama":
-        return OpenAI(api_key="ollama", base_url=_ollama_base(api_key))
+        return anthropic.Anthropic(api_key=api_key, http_client=_pooled_http(anthropic))
+    import openai
+    from openai import OpenAI
+    # Ollama never gets an SDK client: call_llm talks to its native API (_ollama_chat)
     urls = {
         "groq":       "https://api.groq.com/openai/v1",
         "openrouter": "https://openrouter.ai/api/v1",
         "together":   "https://api.together.xyz/v1",
     }
-    return OpenAI(api_key=api_key, base_url=urls.get(provider))
+    return OpenAI(api_key=api_key, base_url=urls.get(provider),
+                  http_client=_pooled_http(openai))
+
+
+# A hosted key that verified in the last _VERIFY_TTL seconds is reported as
+# connected again without another probe (re-clicking Connect to change model).
+# Failures are never cached. Ollama is always probed: its reply lists models.
+_VERIFY_TTL = 30.0
+_VERIFIED: dict = {}          # (provider, key digest) -> monotonic expiry
 
 
 def verify_connection(api_key: str, provider: str) -> tuple[bool, str]:
+    slot = (provider, _key_digest(api_key))
+    if provider != "ollama" and _VERIFIED.get(slot, 0) > time.monotonic():
+        return True, "✅ Connected successfully."
     try:
         if provider == "ollama":
-            import urllib.request, json as _json
-            root = _ollama_root(api_key)
-            req  = urllib.request.urlopen(f"{root}/api/tags", timeout=6)
-            data = _json.loads(req.read())
+            data   = _ollama_tags(_ollama_root(api_key), timeout=6, fresh=True)
             models = [m["name"] for m in data.get("models", [])]
             if models:
                 hint = f" · {len(models)} model(s): {', '.join(models[:3])}"
@@ -247,13 +530,12 @@ def verify_connection(api_key: str, provider: str) -> tuple[bool, str]:
                 hint = " · No models yet — run: ollama pull phi3.5"
             return True, f"🖥️ Ollama connected — local & free!{hint}"
         elif provider == "anthropic":
-            import anthropic
-            c = anthropic.Anthropic(api_key=api_key)
-            c.messages.create(model="claude-3-haiku-20240307", max_tokens=5,
-                              messages=[{"role": "user", "content": "hi"}])
+            # Listing models checks the key without billing a completion
+            get_client(api_key, provider).models.list(limit=1)
         else:
             c = get_client(api_key, provider)
             c.models.list()
+        _VERIFIED[slot] = time.monotonic() + _VERIFY_TTL
         return True, "✅ Connected successfully."
     except Exception as e:
         msg = str(e).lower()
@@ -265,109 +547,274 @@ def verify_connection(api_key: str, provider: str) -> tuple[bool, str]:
 
 
 # ── Core LLM call ────────────────────────────────────────────────
+# Providers whose OpenAI-compatible endpoint reliably honours
+# response_format=json_object. OpenRouter support varies per model; Ollama
+# takes format="json" on its native API (_ollama_chat).
+_JSON_MODE_PROVIDERS = frozenset({"groq", "openai"})
+
+# Ollama is called natively (/api/chat) over the pooled session rather than
+# through the OpenAI SDK and Ollama's compatibility shim, which also lets
+# keep_alive and num_predict go straight to the server.
+_OLLAMA_TIMEOUT = (5, 600)    # connect, read — a CPU-bound reply can take minutes
+
+
+def _ollama_chat(api_key, model, messages, temperature, max_tokens,
+                 on_delta=None, json_mode=False) -> str:
+    stream  = on_delta is not None
+    payload = {"model": model, "messages": messages, "stream": stream,
+               "keep_alive": _OLLAMA_KEEP_ALIVE,
+               "options": {"temperature": temperature, "num_predict": max_tokens}}
+    if json_mode:
+        payload["format"] = "json"
+    r = _http().post(f"{_ollama_root(api_key)}/api/chat", json=payload,
+                     stream=stream, timeout=_OLLAMA_TIMEOUT)
+    if not r.ok:
+        import requests
+        try:
+            detail = r.json().get("error") or r.text
+        except ValueError:
+            detail = r.text
+        raise requests.HTTPError(f"Ollama error {r.status_code}: {detail}", response=r)
+    _WARMED[(_ollama_root(api_key), model)] = time.monotonic()   # a real call keeps it loaded too
+    if not stream:
+        return r.json()["message"]["content"].strip()
+    parts = []
+    with r:
+        for line in r.iter_lines():
+            if not line:
+                continue
+            ev = json.loads(line)
+            if ev.get("error"):
+                raise RuntimeError(f"Ollama error: {ev['error']}")
+            chunk = ev.get("message", {}).get("content")
+            if chunk:
+                parts.append(chunk)
+                on_delta(chunk)
+            if ev.get("done"):
+                break
+    return "".join(parts).strip()
+
+
+# Non-streamed replies are kept for _REPLY_TTL seconds, at most _REPLY_ENTRIES
+# of them, keyed on the API key's digest and every input that shapes the
+# reply, so an identical request from any caller is not paid for twice.
+# Streamed calls (on_delta) always go to the provider, and a JSON
+# reply that doesn't parse is not kept, so asking again can still fix it.
+_REPLY_TTL     = 3600
+_REPLY_ENTRIES = 256
+_REPLIES: OrderedDict = OrderedDict()   # key -> (monotonic time, text)
+_REPLIES_LOCK  = threading.Lock()
+
+
 def call_llm(api_key, provider, model, prompt,
              system_prompt="You are a helpful assistant.",
-             temperature=0.4, max_tokens=700) -> str:
+             temperature=0.4, max_tokens=700, on_delta=None, json_mode=False) -> str:
+    """
+    Single completion. With on_delta the response is streamed and each text
+    chunk is passed to on_delta(chunk) as it arrives; the full text is still
+    returned at the end. json_mode asks providers that support it for a
+    well-formed JSON object; elsewhere it is ignored and _ej does the work.
+    """
+    if on_delta is not None:
+        return _complete(api_key, provider, model, prompt, system_prompt,
+                         temperature, max_tokens, on_delta, json_mode)
+    key = (_key_digest(api_key), provider, model,
+           prompt, system_prompt, temperature, max_tokens, json_mode)
+    now = time.monotonic()
+    with _REPLIES_LOCK:
+        hit = _REPLIES.get(key)
+        if hit and now - hit[0] < _REPLY_TTL:
+            _REPLIES.move_to_end(key)
+            return hit[1]
+    text = _complete(api_key, provider, model, prompt, system_prompt,
+                     temperature, max_tokens, None, json_mode)
+    if json_mode:
+        try:
+            _ej(text)
+        except ValueError:
+            return text
+    with _REPLIES_LOCK:
+        _REPLIES[key] = (now, text)
+        _REPLIES.move_to_end(key)
+        for k in [k for k, (t, _) in _REPLIES.items() if now - t >= _REPLY_TTL]:
+            del _REPLIES[k]
+        while len(_REPLIES) > _REPLY_ENTRIES:
+            _REPLIES.popitem(last=False)
+    return text
+
+
+def _complete(api_key, provider, model, prompt, system_prompt,
+              temperature, max_tokens, on_delta, json_mode) -> str:
     if provider == "anthropic":
-        import anthropic
-        c = anthropic.Anthropic(api_key=api_key)
-        r = c.messages.create(model=model, max_tokens=max_tokens,
-                              temperature=temperature, system=system_prompt,
-                              messages=[{"role": "user", "content": prompt}])
-        return r.content[0].text
+        c  = get_client(api_key, provider)
+        kw = dict(model=model, max_tokens=max_tokens,
+                  temperature=temperature, system=system_prompt,
+                  messages=[{"role": "user", "content": prompt}])
+        if on_delta is None:
+            return c.messages.create(**kw).content[0].text
+        parts = []
+        with c.messages.stream(**kw) as stream:
+            for chunk in stream.text_stream:
+                parts.append(chunk)
+                on_delta(chunk)
+        return "".join(parts)
+    messages = [{"role": "system", "content": system_prompt},
+                {"role": "user",   "content": prompt}]
+    if provider == "ollama":
+        return _ollama_chat(api_key, model, messages, temperature, max_tokens,
+                            on_delta=on_delta, json_mode=json_mode)
     c    = get_client(api_key, provider)
-    msgs = [{"role": "system", "content": system_prompt},
-            {"role": "user",   "content": prompt}]
-    r = c.chat.completions.create(model=model, messages=msgs,
-                                  temperature=temperature, max_tokens=max_tokens)
-    return r.choices[0].message.content.strip()
+    kw   = dict(model=model, temperature=temperature, max_tokens=max_tokens,
+                messages=messages)
+    if json_mode and provider in _JSON_MODE_PROVIDERS:
+        kw["response_format"] = {"type": "json_object"}
+    if on_delta is None:
+        r = c.chat.completions.create(**kw)
+        return r.choices[0].message.content.strip()
+    parts = []
+    for ev in c.chat.completions.create(stream=True, **kw):
+        chunk = ev.choices[0].delta.content if ev.choices else None
+        if chunk:
+            parts.append(chunk)
+            on_delta(chunk)
+    return "".join(parts).strip()
 
 
 # ═══════════════════════════════════════════════════════════════════
 # 1. SESSION PLAN — resume + JD
 # ═══════════════════════════════════════════════════════════════════
-def build_session_plan(api_key, provider, model, resume_text, jd_text) -> dict:
-    if provider == "ollama":
-        _ollama_warmup(api_key, model)
-
-    is_ollama  = provider == "ollama"
-    resume_ctx = _ollama_trim(resume_text, "plan") if is_ollama else _trim(resume_text, _RESUME_LIMIT)
-    jd_ctx     = _ollama_trim(jd_text,     "plan") if is_ollama else _trim(jd_text, _JD_LIMIT)
-    max_tok    = _OLLAMA_TOKENS["plan"] if is_ollama else _PLAN_TOKENS
-
-    prompt = (
+_PLAN_GAPS = '"key_gaps":["<gap>","<gap>","<gap>"],'
+_PLAN_PROFILE = (
+    '"candidate_name":"<first name from resume or Candidate>",'
+    '"target_role":"<role from JD>",'
+    '"company_hints":"<company name if visible or empty string>",'
+    '"key_strengths":["<strength>","<strength>","<strength>"],'
+    + _PLAN_GAPS +
+    '"opening_message":"<2-3 warm sentences welcoming candidate by name>"'
+)
+
+_PLAN_QUESTIONS = (
+    '"question_pool":['
+    '{"id":1,"category":"Opener","question":"Tell me about yourself.","what_great_looks_like":"Past→present→future narrative: education + key experience + specific reason for wanting THIS role. 60-90 seconds. Not a CV recitation.","difficulty":"Easy"},'
+    '{"id":2,"category":"Behavioral","question":"<STAR question from experience>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
+    '{"id":3,"category":"Behavioral","question":"<challenge/failure question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
+    '{"id":4,"category":"Technical","question":"<role-specific technical question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
+    '{"id":5,"category":"Technical","question":"<deeper technical or tool question>","what_great_looks_like":"<1 sentence>","difficulty":"Hard"},'
+    '{"id":6,"category":"Situational","question":"<hypothetical scenario>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
+    '{"id":7,"category":"Leadership","question":"<influence or team question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
+    '{"id":8,"category":"Culture Fit","question":"<values or motivation question>","what_great_looks_like":"<1 sentence>","difficulty":"Easy"},'
+    '{"id":9,"category":"Gap Challenge","question":"<probes weakest gap>","what_great_looks_like":"<1 sentence>","difficulty":"Hard"},'
+    '{"id":10,"category":"Closing","question":"Do you have any questions for me?","what_great_looks_like":"2-3 specific questions showing role knowledge, company research, and strategic thinking. Never ask about salary or basic facts you could Google.","difficulty":"Easy"}'
+    ']'
+)
+
+
+@lru_cache(maxsize=None)
+def _plan_schema(fields: str, provider: str) -> str:
+    """Static tail of a plan-part prompt, built once per (half, provider)."""
+    return (
         'You are an expert interview coach. Analyse this resume and job description.\n'
         'Return ONLY valid JSON:\n'
-        '{"candidate_name":"<first name from resume or Candidate>",'
-        '"target_role":"<role from JD>",'
-        '"company_hints":"<company name if visible or empty string>",'
-        '"key_strengths":["<strength>","<strength>","<strength>"],'
-        '"key_gaps":["<gap>","<gap>","<gap>"],'
-        '"opening_message":"<2-3 warm sentences welcoming candidate by name>",'
-        '"question_pool":['
-        '{"id":1,"category":"Opener","question":"Tell me about yourself.","what_great_looks_like":"Past→present→future narrative: education + key experience + specific reason for wanting THIS role. 60-90 seconds. Not a CV recitation.","difficulty":"Easy"},'
-        '{"id":2,"category":"Behavioral","question":"<STAR question from experience>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
-        '{"id":3,"category":"Behavioral","question":"<challenge/failure question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
-        '{"id":4,"category":"Technical","question":"<role-specific technical question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
-        '{"id":5,"category":"Technical","question":"<deeper technical or tool question>","what_great_looks_like":"<1 sentence>","difficulty":"Hard"},'
-        '{"id":6,"category":"Situational","question":"<hypothetical scenario>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
-        '{"id":7,"category":"Leadership","question":"<influence or team question>","what_great_looks_like":"<1 sentence>","difficulty":"Medium"},'
-        '{"id":8,"category":"Culture Fit","question":"<values or motivation question>","what_great_looks_like":"<1 sentence>","difficulty":"Easy"},'
-        '{"id":9,"category":"Gap Challenge","question":"<probes weakest gap>","what_great_looks_like":"<1 sentence>","difficulty":"Hard"},'
-        '{"id":10,"category":"Closing","question":"Do you have any questions for me?","what_great_looks_like":"2-3 specific questions showing role knowledge, company research, and strategic thinking. Never ask about salary or basic facts you could Google.","difficulty":"Easy"}'
-        ']}'
+        '{' + fields + '}'
         + _brevity(provider, 40) +
-        '\n\nRESUME:\n' + resume_ctx +
-        '\n\nJOB DESCRIPTION:\n' + jd_ctx +
         '\n\nJSON only:'
     )
+
+
+def _plan_part(api_key, provider, model, fields, resume_ctx, jd_ctx, max_tok) -> dict:
+    # Both halves of a split plan share the resume/JD prefix
+    prompt = f'RESUME:\n{resume_ctx}\n\nJOB DESCRIPTION:\n{jd_ctx}\n\n{_plan_schema(fields, provider)}'
     raw = _call_with_retry(api_key, provider, model, prompt,
                            system_prompt="Return ONLY valid JSON. No markdown.",
-                           temperature=0.5, max_tokens=max_tok)
+                           temperature=0.5, max_tokens=max_tok, json_mode=True)
     return _ej(raw)
 
 
+def build_session_plan(api_key, provider, model, resume_text, jd_text) -> dict:
+    if provider == "ollama":
+        keep_ollama_warm(api_key, model)
+        # A local model serves one request at a time — ask for everything at once
+        fields = _PLAN_PROFILE + "," + _PLAN_QUESTIONS
+        fixed  = len(_plan_schema(fields, provider))
+        return _plan_part(api_key, provider, model, fields,
+                          _ollama_trim(resume_text, "plan", fixed),
+                          _ollama_trim(jd_text, "plan", fixed),
+                          _OLLAMA_TOKENS["plan"])
+
+    # Hosted providers: fetch the profile and the question pool concurrently
+    # and merge. Both halves send the resume and JD, trading input tokens for
+    # latency. key_gaps comes from the question half, so gap question 9 probes
+    # the gaps the user is shown.
+    ctx = (_trim(resume_text, _RESUME_LIMIT), _trim(jd_text, _JD_LIMIT))
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        profile = ex.submit(_plan_part, api_key, provider, model,
+                            _PLAN_PROFILE.replace(_PLAN_GAPS, ""), *ctx, _PROFILE_TOKENS)
+        pool    = ex.submit(_plan_part, api_key, provider, model,
+                            _PLAN_GAPS + _PLAN_QUESTIONS, *ctx, _PLAN_TOKENS)
+        plan, questions = profile.result(), pool.result()
+    if not (isinstance(plan, dict) and isinstance(questions, dict)):
+        # A half came back as something other than an object: ask once for the whole plan
+        return _plan_part(api_key, provider, model, _PLAN_PROFILE + "," + _PLAN_QUESTIONS,
+                          *ctx, _PROFILE_TOKENS + _PLAN_TOKENS)
+    plan["key_gaps"]      = questions.get("key_gaps", [])
+    plan["question_pool"] = questions.get("question_pool", [])
+    return plan
+
+
 # ═══════════════════════════════════════════════════════════════════
 # 1b. FIELD-ONLY PLAN
 # ═══════════════════════════════════════════════════════════════════
+# str.format_map template; literal JSON braces are doubled.
+_FIELD_PLAN_TMPL = (
+    'You are an expert interview coach. Build a 10-question interview practice plan.\n'
+    'Return ONLY valid JSON:\n'
+    '{{"candidate_name":"Candidate",'
+    '"target_role":"{field}",'
+    '"company_hints":"",'
+    '"key_strengths":["Prepare specific examples","Show measurable outcomes","Use STAR structure"],'
+    '"key_gaps":["Tailor to {field} context","Quantify impact","Be specific"],'
+    '"opening_message":"<2-3 warm sentences for a {level} {field} candidate>",'
+    '"question_pool":['
+    '{{"id":1,"category":"Opener","question":"Tell me about yourself and what draws you to {field}.","what_great_looks_like":"Past→present→future narrative. Specific, genuine reason for wanting THIS role in {field}. 60-90 seconds. Not a CV recitation.","difficulty":"Easy"}},'
+    '{{"id":2,"category":"Behavioral","question":"<STAR behavioral for {field} at {level}>","what_great_looks_like":"Specific example with result","difficulty":"Medium"}},'
+    '{{"id":3,"category":"Behavioral","question":"<challenge question for {field}>","what_great_looks_like":"Shows self-awareness","difficulty":"Medium"}},'
+    '{{"id":4,"category":"Technical","question":"<core technical question for {field}>","what_great_looks_like":"Clear explanation with example","difficulty":"Medium"}},'
+    '{{"id":5,"category":"Technical","question":"<advanced technical for {field}>","what_great_looks_like":"Structured thinking","difficulty":"Hard"}},'
+    '{{"id":6,"category":"Situational","question":"<workplace scenario for {field}>","what_great_looks_like":"Logical approach","difficulty":"Medium"}},'
+    '{{"id":7,"category":"Leadership","question":"<collaboration question for {level} {field}>","what_great_looks_like":"Shows impact on others","difficulty":"Medium"}},'
+    '{{"id":8,"category":"Culture Fit","question":"What work environment brings out your best?","what_great_looks_like":"Authentic and specific","difficulty":"Easy"}},'
+    '{{"id":9,"category":"Motivation","question":"<career goals for {field}>","what_great_looks_like":"Forward-looking and genuine","difficulty":"Easy"}},'
+    '{{"id":10,"category":"Closing","question":"Do you have any questions for me?","what_great_looks_like":"2-3 sharp questions: one about real role challenges, one about team/success metrics, one about strategic direction. No salary questions.","difficulty":"Easy"}}'
+    ']}}'
+    '{brevity}'
+    '\n\nFIELD: {field}'
+    '\nEXPERIENCE: {level}'
+    '\nFOCUS: {focus}'
+    '\n\nJSON only:'
+)
+
+
+_FIELD_PLAN_SYSTEM = "Return ONLY valid JSON. No markdown."
+
+
+def _field_plan_prompt(provider, field, experience_level, focus_areas) -> str:
+    focus_str = ", ".join(focus_areas) if focus_areas else "Behavioral, Technical, Situational"
+    return _FIELD_PLAN_TMPL.format_map({
+        "field": field, "level": experience_level, "focus": focus_str,
+        "brevity": _brevity(provider, 40),
+    })
+
+
 def build_field_plan(api_key, provider, model, field,
                      experience_level, focus_areas) -> dict:
     if provider == "ollama":
-        _ollama_warmup(api_key, model)
-
-    focus_str = ", ".join(focus_areas) if focus_areas else "Behavioral, Technical, Situational"
-    max_tok   = _OLLAMA_TOKENS["plan"] if provider == "ollama" else _PLAN_TOKENS
+        keep_ollama_warm(api_key, model)
 
-    prompt = (
-        'You are an expert interview coach. Build a 10-question interview practice plan.\n'
-        'Return ONLY valid JSON:\n'
-        '{"candidate_name":"Candidate",'
-        '"target_role":"' + field + '",'
-        '"company_hints":"",'
-        '"key_strengths":["Prepare specific examples","Show measurable outcomes","Use STAR structure"],'
-        '"key_gaps":["Tailor to ' + field + ' context","Quantify impact","Be specific"],'
-        '"opening_message":"<2-3 warm sentences for a ' + experience_level + ' ' + field + ' candidate>",'
-        '"question_pool":['
-        '{"id":1,"category":"Opener","question":"Tell me about yourself and what draws you to ' + field + '.","what_great_looks_like":"Past→present→future narrative. Specific, genuine reason for wanting THIS role in ' + field + '. 60-90 seconds. Not a CV recitation.","difficulty":"Easy"},'
-        '{"id":2,"category":"Behavioral","question":"<STAR behavioral for ' + field + ' at ' + experience_level + '>","what_great_looks_like":"Specific example with result","difficulty":"Medium"},'
-        '{"id":3,"category":"Behavioral","question":"<challenge question for ' + field + '>","what_great_looks_like":"Shows self-awareness","difficulty":"Medium"},'
-        '{"id":4,"category":"Technical","question":"<core technical question for ' + field + '>","what_great_looks_like":"Clear explanation with example","difficulty":"Medium"},'
-        '{"id":5,"category":"Technical","question":"<advanced technical for ' + field + '>","what_great_looks_like":"Structured thinking","difficulty":"Hard"},'
-        '{"id":6,"category":"Situational","question":"<workplace scenario for ' + field + '>","what_great_looks_like":"Logical approach","difficulty":"Medium"},'
-        '{"id":7,"category":"Leadership","question":"<collaboration question for ' + experience_level + ' ' + field + '>","what_great_looks_like":"Shows impact on others","difficulty":"Medium"},'
-        '{"id":8,"category":"Culture Fit","question":"What work environment brings out your best?","what_great_looks_like":"Authentic and specific","difficulty":"Easy"},'
-        '{"id":9,"category":"Motivation","question":"<career goals for ' + field + '>","what_great_looks_like":"Forward-looking and genuine","difficulty":"Easy"},'
-        '{"id":10,"category":"Closing","question":"Do you have any questions for me?","what_great_looks_like":"2-3 sharp questions: one about real role challenges, one about team/success metrics, one about strategic direction. No salary questions.","difficulty":"Easy"}'
-        ']}'
-        + _brevity(provider, 40) +
-        '\n\nFIELD: ' + field +
-        '\nEXPERIENCE: ' + experience_level +
-        '\nFOCUS: ' + focus_str +
-        '\n\nJSON only:'
-    )
+    max_tok = _OLLAMA_TOKENS["plan"] if provider == "ollama" else _PLAN_TOKENS
+    prompt  = _field_plan_prompt(provider, field, experience_level, focus_areas)
     raw = _call_with_retry(api_key, provider, model, prompt,
-                           system_prompt="Return ONLY valid JSON. No markdown.",
-                           temperature=0.6, max_tokens=max_tok)
+                           system_prompt=_FIELD_PLAN_SYSTEM,
+                           temperature=0.6, max_tokens=max_tok, json_mode=True)
     return _ej(raw)
 
 
@@ -523,10 +970,63 @@ def _star_prompt_fields() -> str:
     )
 
 
+@lru_cache(maxsize=None)
+def _grade_spec(ctype: str) -> tuple:
+    """(system prompt, rubric JSON, model-answer fields, coach persona) for a category type."""
+    if ctype == "opener":
+        return (_opener_system(), _opener_rubric_scores(), _opener_prompt_fields(),
+                "experienced HR recruiter who has heard thousands of these pitches")
+    if ctype == "closing":
+        return (_closing_system(), _closing_rubric_scores(), _closing_prompt_fields(),
+                "senior hiring manager who judges candidates on the quality of their questions")
+    return (_star_system(), _star_rubric_scores(), _star_prompt_fields(),
+            "technical interview coach who has coached candidates into top companies")
+
+
+@lru_cache(maxsize=None)
+def _grade_fields(rubric_json: str, answer_fields: str) -> str:
+    """Body of the grade JSON object, shared by single and marshalled grading."""
+    return (
+        '  "score": <integer 0-100>,\n'
+        '  "grade": "<A|B|C|D|F>",\n'
+        + rubric_json +
+        '  "what_worked": [\n'
+        '    "<specific strength referencing the candidate\'s actual words — not generic praise>",\n'
+        '    "<another specific strength>"\n'
+        '  ],\n'
+        '  "what_missed": [\n'
+        '    "<specific gap or missed opportunity — concrete, not vague>",\n'
+        '    "<another gap>"\n'
+        '  ],\n'
+        '  "coach_reaction": "<2-3 warm, human sentences reacting to THIS specific answer. '
+        'Reference the candidate\'s actual words. Acknowledge what landed. '
+        'Point to the biggest lever for improvement. Sound like a real person who just listened carefully.>",\n'
+        + answer_fields +
+        '  "follow_up_question": "<one natural follow-up the interviewer would ask next, '
+        'based on what the model answer revealed>",\n'
+        '  "encouragement": "<1-2 specific sentences: name something real from their answer '
+        'that showed promise, then give one concrete thing to practise before the real interview.>"\n'
+    )
+
+
+@lru_cache(maxsize=None)
+def _grade_schema(ctype: str) -> str:
+    """Static middle of the single-answer grade prompt: persona and JSON shape."""
+    _, rubric_json, answer_fields, coach_persona = _grade_spec(ctype)
+    return (
+        f'Grade this interview answer as an {coach_persona}.\n\n'
+        'Return ONLY this JSON (no markdown, no extra text):\n'
+        '{\n'
+        + _grade_fields(rubric_json, answer_fields) +
+        '}\n\n'
+    )
+
+
 def grade_answer(api_key, provider, model, question, user_answer,
-                 category, resume_text, jd_text) -> dict:
+                 category, resume_text, jd_text, on_delta=None) -> dict:
     """
-    v5: category-aware grading engine.
+    v5: category-aware grading engine. Pass on_delta to stream the raw
+    response (see call_llm); the parsed dict is returned either way.
 
     Opener  → evaluated as an HR recruiter would: narrative arc, experience relevance,
               motivation/fit, delivery. NO STAR rubric.
@@ -546,67 +1046,34 @@ def grade_answer(api_key, provider, model, question, user_answer,
       encouragement     — specific 1-2 sentence nudge
     """
     is_ollama  = provider == "ollama"
-    resume_ctx = _ollama_trim(resume_text, "grade") if is_ollama else _trim(resume_text, 1000)
-    jd_ctx     = _ollama_trim(jd_text,     "grade") if is_ollama else _trim(jd_text, 600)
+    ctype      = _category_type(category)
+    fixed      = (len(_grade_spec(ctype)[0]) + len(_grade_schema(ctype))
+                  + len(question) + min(len(user_answer), 1200)) if is_ollama else 0
+    resume_ctx = _ollama_trim(resume_text, "grade", fixed) if is_ollama else _trim(resume_text, 1000)
+    jd_ctx     = _ollama_trim(jd_text,     "grade", fixed) if is_ollama else _trim(jd_text, 600)
     max_tok    = _OLLAMA_TOKENS["grade"] if is_ollama else _GRADE_TOKENS
 
-    ctype = _category_type(category)
-
-    # Pick the right system prompt, rubric fields, and model answer instructions
-    if ctype == "opener":
-        system        = _opener_system()
-        rubric_json   = _opener_rubric_scores()
-        answer_fields = _opener_prompt_fields()
-        coach_persona = "experienced HR recruiter who has heard thousands of these pitches"
-    elif ctype == "closing":
-        system        = _closing_system()
-        rubric_json   = _closing_rubric_scores()
-        answer_fields = _closing_prompt_fields()
-        coach_persona = "senior hiring manager who judges candidates on the quality of their questions"
-    else:
-        system        = _star_system()
-        rubric_json   = _star_rubric_scores()
-        answer_fields = _star_prompt_fields()
-        coach_persona = "technical interview coach who has coached candidates into top companies"
-
+    # Session-invariant context and schema first, the answer last, so the
+    # provider's prompt-prefix cache can reuse everything before QUESTION.
+    # The schema for each category type is built once (_grade_schema).
     prompt = (
-        f'Grade this interview answer as an {coach_persona}.\n\n'
-        'Return ONLY this JSON (no markdown, no extra text):\n'
-        '{\n'
-        '  "score": <integer 0-100>,\n'
-        '  "grade": "<A|B|C|D|F>",\n'
-        + rubric_json +
-        '  "what_worked": [\n'
-        '    "<specific strength referencing the candidate\'s actual words — not generic praise>",\n'
-        '    "<another specific strength>"\n'
-        '  ],\n'
-        '  "what_missed": [\n'
-        '    "<specific gap or missed opportunity — concrete, not vague>",\n'
-        '    "<another gap>"\n'
-        '  ],\n'
-        '  "coach_reaction": "<2-3 warm, human sentences reacting to THIS specific answer. '
-        'Reference the candidate\'s actual words. Acknowledge what landed. '
-        'Point to the biggest lever for improvement. Sound like a real person who just listened carefully.>",\n'
-        + answer_fields +
-        '  "follow_up_question": "<one natural follow-up the interviewer would ask next, '
-        'based on what the model answer revealed>",\n'
-        '  "encouragement": "<1-2 specific sentences: name something real from their answer '
-        'that showed promise, then give one concrete thing to practise before the real interview.>"\n'
-        '}\n\n'
+        (f'CANDIDATE RESUME (use to personalise the model answer):\n{resume_ctx}\n\n' if resume_ctx else '')
+        + (f'JOB CONTEXT:\n{jd_ctx}\n\n' if jd_ctx else '')
+        + f'{_grade_schema(ctype)}'
         f'QUESTION: {question}\n'
         f'CATEGORY: {category}\n\n'
         f'CANDIDATE ANSWER:\n{user_answer[:1200]}\n\n'
-        + (f'CANDIDATE RESUME (use to personalise the model answer):\n{resume_ctx}\n\n' if resume_ctx else '')
-        + (f'JOB CONTEXT:\n{jd_ctx}\n\n' if jd_ctx else '')
-        + 'JSON only:'
+        'JSON only:'
     )
 
     raw = _call_with_retry(api_key, provider, model, prompt,
-                           system_prompt=system,
+                           system_prompt=_grade_spec(ctype)[0],
                            temperature=0.72,
-                           max_tokens=max_tok)
-    result = _ej(raw)
+                           max_tokens=max_tok, on_delta=on_delta, json_mode=True)
+    return _finish_grade(_ej(raw), ctype)
+
 
+def _finish_grade(result: dict, ctype: str) -> dict:
     # ── Normalise: ensure rubric_scores and rubric_labels always exist ──
     if "rubric_scores" not in result:
         # Old model returned star_scores — migrate gracefully
@@ -650,16 +1117,12 @@ def grade_answer(api_key, provider, model, question, user_answer,
 # 3. FOLLOW-UP COACHING CHAT
 # ═══════════════════════════════════════════════════════════════════
 def coach_followup(api_key, provider, model, conversation_history,
-                   resume_text, jd_text) -> str:
+                   resume_text, jd_text, on_delta=None) -> str:
     is_ollama = provider == "ollama"
-    history_str = ""
-    for msg in conversation_history[-8:]:
-        role = "Candidate" if msg["role"] == "user" else "Coach Alex"
-        history_str += f"{role}: {msg['content']}\n\n"
-
-    resume_ctx = _ollama_trim(resume_text, "chat") if is_ollama else _trim(resume_text, 1000)
-    jd_ctx     = _ollama_trim(jd_text,     "chat") if is_ollama else _trim(jd_text, 700)
-    max_tok    = _OLLAMA_TOKENS["chat"] if is_ollama else _CHAT_TOKENS
+    history_str = "".join(
+        f"{'Candidate' if msg['role'] == 'user' else 'Coach Alex'}: {msg['content']}\n\n"
+        for msg in conversation_history[-8:]
+    )
 
     sys = (
         "You are Alex, a senior interview coach with 15 years of experience. "
@@ -672,6 +1135,11 @@ def coach_followup(api_key, provider, model, conversation_history,
         "You are a real coach who has just spent time with this person, not a chatbot. "
         "Keep to 2-4 short paragraphs."
     )
+    fixed      = len(sys) + len(history_str)
+    resume_ctx = _ollama_trim(resume_text, "chat", fixed) if is_ollama else _trim(resume_text, 1000)
+    jd_ctx     = _ollama_trim(jd_text,     "chat", fixed) if is_ollama else _trim(jd_text, 700)
+    max_tok    = _OLLAMA_TOKENS["chat"] if is_ollama else _CHAT_TOKENS
+
     prompt = (
         "CANDIDATE RESUME:\n" + resume_ctx +
         "\n\nJOB THEY'RE APPLYING FOR:\n" + jd_ctx +
@@ -679,14 +1147,15 @@ def coach_followup(api_key, provider, model, conversation_history,
         "\nCoach Alex (respond naturally, as a real human coach would):"
     )
     return call_llm(api_key, provider, model, prompt,
-                    system_prompt=sys, temperature=0.72, max_tokens=max_tok)
+                    system_prompt=sys, temperature=0.72, max_tokens=max_tok,
+                    on_delta=on_delta)
 
 
 # ═══════════════════════════════════════════════════════════════════
 # 4. QUICK TIP
 # ═══════════════════════════════════════════════════════════════════
 def get_question_tip(api_key, provider, model, question, category,
-                     resume_text, jd_text) -> str:
+                     resume_text, jd_text, on_delta=None) -> str:
     is_ollama  = provider == "ollama"
     resume_ctx = _ollama_trim(resume_text, "tip") if is_ollama else _trim(resume_text, 1200)
     jd_ctx     = _ollama_trim(jd_text,     "tip") if is_ollama else _trim(jd_text, 800)
@@ -732,57 +1201,72 @@ def get_question_tip(api_key, provider, model, question, category,
         )
 
     prompt = (
-        f"Question: {question}\nCategory: {category}\n\n"
-        + tip_instruction
+        "CANDIDATE RESUME:\n" + resume_ctx +
+        "\n\nJOB:\n" + jd_ctx + "\n\n"
+        + tip_instruction.rstrip()
         + _brevity(provider, 70) +
-        "\n\nCANDIDATE RESUME:\n" + resume_ctx +
-        "\n\nJOB:\n" + jd_ctx
+        f"\n\nQuestion: {question}\nCategory: {category}"
     )
     return call_llm(api_key, provider, model, prompt,
-                    system_prompt=sys, temperature=0.65, max_tokens=max_tok)
+                    system_prompt=sys, temperature=0.65, max_tokens=max_tok,
+                    on_delta=on_delta)
 
 
 # ═══════════════════════════════════════════════════════════════════
 # 5. FINAL SESSION REPORT
 # ═══════════════════════════════════════════════════════════════════
+_REPORT_SCHEMA = (
+    'Generate a final interview coaching report. Return ONLY JSON:\n'
+    '{"overall_score":<0-100>,"overall_grade":"A|B|C|D|F",'
+    '"tier":"Interview Ready|Almost There|Needs Practice|Significant Work Needed",'
+    '"headline":"<one punchy specific sentence summarising their performance — not generic>",'
+    '"top_strengths":["<specific strength observed in their answers>","<strength>","<strength>"],'
+    '"priority_improvements":['
+    '{"area":"<area>","issue":"<specific issue from their actual answers>",'
+    '"fix":"<concrete actionable fix — if possible, give an example of what good looks like>"},'
+    '{"area":"<area>","issue":"<specific issue>","fix":"<fix>"},'
+    '{"area":"<area>","issue":"<specific issue>","fix":"<fix>"}],'
+    '"category_scores":{"Opener":0,"Behavioral":0,"Technical":0,"Situational":0,"Leadership":0,"Culture Fit":0},'
+    '"action_plan":["<specific concrete thing to practise this week>","<action>","<action>","<action>"],'
+    '"personal_note":"<3-4 warm personal closing sentences from Alex. Reference specific moments '
+    'from the session. Acknowledge the candidate\'s effort genuinely. End on an encouraging note '
+    'that feels like it comes from a real coach who just spent an hour with them, not a template.>"}'
+)
+
+
+def _report_row(i: int, item: dict) -> str:
+    """One answered question as a SESSION DATA line block."""
+    g = item.get("grade", {})
+    return (
+        f"Q{i} [{item.get('category','')}]: {item.get('question','')[:80]}\n"
+        f"Score: {g.get('score',0)}/100 ({g.get('grade','?')}) | "
+        f"Worked: {'; '.join(g.get('what_worked',[])[:1])} | "
+        f"Missed: {'; '.join(g.get('what_missed',[]))}\n\n"
+    )
+
+
 def build_session_report(api_key, provider, model, session_data,
-                         resume_text, jd_text) -> dict:
+                         resume_text, jd_text, on_delta=None) -> dict:
+    """
+    One request for the whole session: every answer is summarised from the
+    grade it already received (score, one strength, the gaps), so nothing is
+    re-graded and the resume/JD context is sent once, not per question.
+    """
     is_ollama = provider == "ollama"
-    qa_summary = ""
-    for i, item in enumerate(session_data, 1):
-        g = item.get("grade", {})
-        qa_summary += (
-            f"Q{i} [{item.get('category','')}]: {item.get('question','')[:80]}\n"
-            f"Score: {g.get('score',0)}/100 ({g.get('grade','?')}) | "
-            f"Worked: {'; '.join(g.get('what_worked',[])[:1])} | "
-            f"Missed: {'; '.join(g.get('what_missed',[]))}\n\n"
-        )
+    qa_summary = "".join(_report_row(i, item) for i, item in enumerate(session_data, 1))
 
-    resume_ctx = _ollama_trim(resume_text, "report") if is_ollama else _trim(resume_text, 800)
-    jd_ctx     = _ollama_trim(jd_text,     "report") if is_ollama else _trim(jd_text, 600)
+    fixed      = len(_REPORT_SCHEMA) + len(qa_summary)
+    resume_ctx = _ollama_trim(resume_text, "report", fixed) if is_ollama else _trim(resume_text, 800)
+    jd_ctx     = _ollama_trim(jd_text,     "report", fixed) if is_ollama else _trim(jd_text, 600)
     max_tok    = _OLLAMA_TOKENS["report"] if is_ollama else _REPORT_TOKENS
 
     prompt = (
-        'Generate a final interview coaching report. Return ONLY JSON:\n'
-        '{"overall_score":<0-100>,"overall_grade":"A|B|C|D|F",'
-        '"tier":"Interview Ready|Almost There|Needs Practice|Significant Work Needed",'
-        '"headline":"<one punchy specific sentence summarising their performance — not generic>",'
-        '"top_strengths":["<specific strength observed in their answers>","<strength>","<strength>"],'
-        '"priority_improvements":['
-        '{"area":"<area>","issue":"<specific issue from their actual answers>",'
-        '"fix":"<concrete actionable fix — if possible, give an example of what good looks like>"},'
-        '{"area":"<area>","issue":"<specific issue>","fix":"<fix>"},'
-        '{"area":"<area>","issue":"<specific issue>","fix":"<fix>"}],'
-        '"category_scores":{"Opener":0,"Behavioral":0,"Technical":0,"Situational":0,"Leadership":0,"Culture Fit":0},'
-        '"action_plan":["<specific concrete thing to practise this week>","<action>","<action>","<action>"],'
-        '"personal_note":"<3-4 warm personal closing sentences from Alex. Reference specific moments '
-        'from the session. Acknowledge the candidate\'s effort genuinely. End on an encouraging note '
-        'that feels like it comes from a real coach who just spent an hour with them, not a template.>"}'
+        'RESUME:\n' + resume_ctx +
+        '\nJOB:\n' + jd_ctx + '\n\n'
+        + _REPORT_SCHEMA
         + _brevity(provider, 60) +
         '\n\nSESSION DATA:\n' + qa_summary +
-        'RESUME:\n' + resume_ctx +
-        '\nJOB:\n' + jd_ctx +
-        '\nJSON only:'
+        'JSON only:'
     )
     raw = _call_with_retry(api_key, provider, model, prompt,
                            system_prompt=(
@@ -791,7 +1275,8 @@ def build_session_report(api_key, provider, model, session_data,
                                "just spent time with you and deserves a real response, not a template. "
                                "Return ONLY valid JSON. No markdown."
                            ),
-                           temperature=0.65, max_tokens=max_tok)
+                           temperature=0.65, max_tokens=max_tok, on_delta=on_delta,
+                           json_mode=True)
     return _ej(raw)
 
 
@@ -799,16 +1284,12 @@ def build_session_report(api_key, provider, model, session_data,
 # 6. FREE CHAT
 # ═══════════════════════════════════════════════════════════════════
 def free_chat(api_key, provider, model, messages,
-              resume_text="", jd_text="") -> str:
+              resume_text="", jd_text="", on_delta=None) -> str:
     is_ollama = provider == "ollama"
-    history = ""
-    for m in messages[-10:]:
-        role = "You" if m["role"] == "user" else "Coach Alex"
-        history += f"{role}: {m['content']}\n\n"
-
-    resume_ctx = _ollama_trim(resume_text, "chat") if is_ollama else _trim(resume_text, 1000)
-    jd_ctx     = _ollama_trim(jd_text,     "chat") if is_ollama else _trim(jd_text, 700)
-    max_tok    = _OLLAMA_TOKENS["chat"] if is_ollama else _CHAT_TOKENS
+    history = "".join(
+        f"{'You' if m['role'] == 'user' else 'Coach Alex'}: {m['content']}\n\n"
+        for m in messages[-10:]
+    )
 
     sys = (
         "You are Alex, a senior interview coach with 15 years of experience. "
@@ -820,21 +1301,168 @@ def free_chat(api_key, provider, model, messages,
         "You genuinely want this person to succeed — it comes through in how you respond. "
         "Keep replies to 2-4 paragraphs. Be a real coach, not a chatbot."
     )
+    fixed      = len(sys) + len(history)
+    resume_ctx = _ollama_trim(resume_text, "chat", fixed) if is_ollama else _trim(resume_text, 1000)
+    jd_ctx     = _ollama_trim(jd_text,     "chat", fixed) if is_ollama else _trim(jd_text, 700)
+    max_tok    = _OLLAMA_TOKENS["chat"] if is_ollama else _CHAT_TOKENS
+
     prompt = (
         ("CANDIDATE RESUME:\n" + resume_ctx + "\n\n" if resume_ctx else "") +
         ("TARGET JOB:\n"       + jd_ctx     + "\n\n" if jd_ctx     else "") +
         "CONVERSATION:\n" + history + "Coach Alex:"
     )
     return call_llm(api_key, provider, model, prompt,
-                    system_prompt=sys, temperature=0.72, max_tokens=max_tok)
+                    system_prompt=sys, temperature=0.72, max_tokens=max_tok,
+                    on_delta=on_delta)
 
 
 # ═══════════════════════════════════════════════════════════════════
 # 7. VOICE TRANSCRIPTION  (Groq Whisper / OpenAI Whisper)
 # ═══════════════════════════════════════════════════════════════════
-def transcribe_audio(audio_bytes: bytes, api_key: str, provider: str) -> str:
+# Recordings are transcribed as soon as they arrive, on a small shared pool,
+# so the work overlaps the user reviewing the clip before they ask for text.
+# The pool is only started by the first recording.
+_STT_POOL = None
+_STT_LOCK = threading.Lock()
+
+
+def transcribe_in_background(audio, api_key: str, provider: str):
+    """
+    Start transcribe_audio on a worker thread; returns its Future. The clip's
+    bytes are read here, on the calling (script) thread, so the worker never
+    touches an UploadedFile the next script run may have moved past.
+    """
+    global _STT_POOL
+    if _STT_POOL is None:
+        with _STT_LOCK:
+            if _STT_POOL is None:
+                _STT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt")
+    if not isinstance(audio, (bytes, bytearray, memoryview)):
+        name = getattr(audio, "name", None)
+        audio.seek(0)
+        audio = io.BytesIO(audio.read())
+        audio.name = name or "answer.wav"
+    return _STT_POOL.submit(transcribe_audio, audio, api_key, provider)
+
+
+# faster-whisper model for local transcription, built once per process:
+# loading the weights takes far longer than transcribing a short answer.
+# int8 is CTranslate2's fastest CPU type; WHISPER_COMPUTE_TYPE=int8_float16
+# suits CPUs with fast fp16, and WHISPER_MODEL_SIZE trades speed for accuracy.
+# Answers are always English, so the English-only checkpoint is the default:
+# base's size and speed with lower English WER. "distil-small.en" is the step
+# up in accuracy for CPUs that can spare roughly twice the compute.
+_WHISPER_SIZE    = os.environ.get("WHISPER_MODEL_SIZE", "base.en")
+_WHISPER_COMPUTE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")
+_WHISPER_BATCH   = 8
+_WHISPER_MODELS: dict = {}
+_WHISPER_LOCK = threading.Lock()
+
+
+def _whisper(size: str, compute_type: str) -> tuple:
+    """
+    (transcriber, extra transcribe kwargs), built once per size and compute
+    type. Where faster-whisper has BatchedInferencePipeline (1.1+) the model
+    is wrapped in it, so the VAD segments of a long answer are decoded in
+    batches instead of one 30-second window after another.
+    """
+    with _WHISPER_LOCK:
+        entry = _WHISPER_MODELS.get((size, compute_type))
+        if entry is None:
+            import faster_whisper
+            model = faster_whisper.WhisperModel(
+                size, device="cpu", compute_type=compute_type,
+                cpu_threads=os.cpu_count() or 0, num_workers=1)
+            batched = getattr(faster_whisper, "BatchedInferencePipeline", None)
+            entry = _WHISPER_MODELS[(size, compute_type)] = (
+                (batched(model=model), {"batch_size": _WHISPER_BATCH}) if batched
+                else (model, {}))
+    return entry
+
+
+# Browser recordings carry a second or more of silence at each end, and hosted
+# Whisper is billed and timed by duration. Windows whose peak stays under
+# _SILENCE_PEAK (about -36 dBFS) are cut from the ends, keeping _SILENCE_PAD
+# either side of the speech.
+_SILENCE_PEAK = 500
+_SILENCE_WIN  = 0.03    # seconds
+_SILENCE_PAD  = 0.25    # seconds
+
+
+def _trim_silence(audio):
+    """
+    Leading and trailing silence cut from a 16-bit PCM WAV (what st.audio_input
+    records). Anything else, or a clip with nothing to cut, comes back as is,
+    rewound.
+    """
+    import array, sys, wave
+    try:
+        with wave.open(audio, "rb") as w:
+            if w.getsampwidth() != 2:
+                raise wave.Error("not 16-bit PCM")
+            params = w.getparams()
+            frames = w.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        audio.seek(0)
+        return audio
+    samples = array.array("h", frames)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    n   = len(samples)
+    win = max(1, int(params.framerate * _SILENCE_WIN)) * params.nchannels
+
+    def loud(i):
+        seg = samples[i:i + win]
+        return max(max(seg), -min(seg)) > _SILENCE_PEAK
+
+    start = 0
+    while start < n and not loud(start):
+        start += win
+    if start >= n:                     # all silence: let the backend say so
+        audio.seek(0)
+        return audio
+    end = n
+    while end - win > start and not loud(end - win):
+        end -= win
+    pad   = int(params.framerate * _SILENCE_PAD) * params.nchannels
+    start = max(0, start - pad)
+    end   = min(n, end + pad)
+    if start == 0 and end == n:        # nothing to trim
+        audio.seek(0)
+        return audio
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setparams(params)
+        w.writeframes(frames[start * 2:end * 2])
+    out.seek(0)
+    return out
+
+
+def _wav_16k_mono(audio):
     """
-    Transcribe raw audio bytes (WebM/Opus from browser MediaRecorder) to text.
+    Samples of a 16 kHz mono 16-bit WAV (st.audio_input's default recording)
+    as float32 in [-1, 1], the array faster-whisper decodes to anyway; None,
+    rewound, for anything that needs PyAV to decode or resample.
+    """
+    import wave
+    try:
+        with wave.open(audio, "rb") as w:
+            if (w.getframerate(), w.getnchannels(), w.getsampwidth()) != (16000, 1, 2):
+                raise wave.Error("needs resampling")
+            frames = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        audio.seek(0)
+        return None
+    import numpy as np
+    return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def transcribe_audio(audio, api_key: str, provider: str) -> str:
+    """
+    Transcribe a recorded answer to text. `audio` is a binary file-like object
+    (e.g. the UploadedFile from st.audio_input, WAV) or raw bytes; file-likes
+    are handed straight to the backend without copying the payload, unless a
+    WAV has silence at either end to trim (_trim_silence).
 
     Backends:
       groq       → Groq Whisper large-v3-turbo (free, fast, best quality)
@@ -844,59 +1472,44 @@ def transcribe_audio(audio_bytes: bytes, api_key: str, provider: str) -> str:
 
     Returns the transcribed text string.
     """
-    import tempfile, os
-
-    # Write audio to temp file — all Whisper APIs need a file path
-    with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = tmp.name
-
-    try:
-        if provider == "groq":
-            from groq import Groq
-            client = Groq(api_key=api_key)
-            with open(tmp_path, "rb") as f:
-                result = client.audio.transcriptions.create(
-                    file=(os.path.basename(tmp_path), f.read()),
-                    model="whisper-large-v3-turbo",
-                    response_format="text",
-                    language="en",
-                )
-            return str(result).strip()
-
-        elif provider == "openai":
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            with open(tmp_path, "rb") as f:
-                result = client.audio.transcriptions.create(
-                    file=f, model="whisper-1", response_format="text",
-                )
-            return str(result).strip()
-
-        elif provider == "ollama":
-            # Try faster-whisper (local CPU, no API key needed)
-            try:
-                from faster_whisper import WhisperModel
-                model = WhisperModel("base", device="cpu", compute_type="int8")
-                segments, _ = model.transcribe(tmp_path, language="en")
-                return " ".join(s.text.strip() for s in segments).strip()
-            except ImportError:
-                raise ValueError(
-                    "Ollama doesn't include speech-to-text. "
-                    "Install faster-whisper for local transcription: "
-                    "pip install faster-whisper  — or switch to Groq (free) "
-                    "for easy cloud transcription."
-                )
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = io.BytesIO(audio)
+    audio.seek(0)
+    name = getattr(audio, "name", None) or "answer.wav"
+
+    if provider in ("groq", "openai"):
+        # Groq serves Whisper on its OpenAI-compatible endpoint, so both go
+        # through the cached client rather than loading a second SDK.
+        client = get_client(api_key, provider)
+        opts = ({"model": "whisper-large-v3-turbo", "language": "en"}
+                if provider == "groq" else {"model": "whisper-1"})
+        result = client.audio.transcriptions.create(
+            file=(name, _trim_silence(audio)), response_format="text", **opts,
+        )
+        return str(result).strip()
 
-        else:
-            # anthropic, openrouter — no audio API
+    elif provider == "ollama":
+        # Try faster-whisper (local CPU, no API key needed)
+        try:
+            model, extra = _whisper(_WHISPER_SIZE, _WHISPER_COMPUTE)
+            samples = _wav_16k_mono(audio)
+            # Built-in Silero VAD: only voiced stretches reach the decoder
+            segments, _ = model.transcribe(audio if samples is None else samples,
+                                           language="en", vad_filter=True,
+                                           vad_parameters={"min_silence_duration_ms": 300},
+                                           **extra)
+            return " ".join(s.text.strip() for s in segments).strip()
+        except ImportError:
             raise ValueError(
-                f"{provider.title()} doesn't support audio transcription. "
-                "Switch to Groq (free) or OpenAI to use voice recording."
+                "Ollama doesn't include speech-to-text. "
+                "Install faster-whisper for local transcription: "
+                "pip install faster-whisper  — or switch to Groq (free) "
+                "for easy cloud transcription."
             )
 
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
+    else:
+        # anthropic, openrouter — no audio API
+        raise ValueError(
+            f"{provider.title()} doesn't support audio transcription. "
+            "Switch to Groq (free) or OpenAI to use voice recording."
+        )
@@ -0,0 +1,41 @@
+"""
+Interview Coach AI - Provider catalogue
+Model lists and key links for the sidebar. Kept free of SDK imports so the
+UI can render before the LLM core is loaded.
+"""
+from __future__ import annotations
+
+
+# ── Provider model catalogue ──────────────────────────────────────
+PROVIDER_MODELS = {
+    "groq": {
+        "Llama 3.3 70B — Recommended (FREE)": "llama-3.3-70b-versatile",
+        "Llama 3.1 8B — Fastest (FREE)":      "llama-3.1-8b-instant",
+        "Mixtral 8x7B (FREE)":                 "mixtral-8x7b-32768",
+    },
+    "openai": {
+        "GPT-4o Mini — Budget": "gpt-4o-mini",
+        "GPT-4o — Best":        "gpt-4o",
+        "GPT-3.5 Turbo":        "gpt-3.5-turbo",
+    },
+    "anthropic": {
+        "Claude 3 Haiku — Cheapest": "claude-3-haiku-20240307",
+        "Claude 3.5 Sonnet":         "claude-3-5-sonnet-20241022",
+    },
+    "openrouter": {
+        "Llama 3.3 70B (Free tier)": "meta-llama/llama-3.3-70b-instruct",
+        "Mistral 7B (Budget)":       "mistralai/mistral-7b-instruct",
+        "GPT-4o Mini":               "openai/gpt-4o-mini",
+    },
+    "ollama": {
+        "⚡ Connect first to see your installed models": "llama3.2",
+    },
+}
+
+HELP_LINKS = {
+    "groq":       "https://console.groq.com/keys",
+    "openai":     "https://platform.openai.com/api-keys",
+    "anthropic":  "https://console.anthropic.com/settings/keys",
+    "openrouter": "https://openrouter.ai/keys",
+    "ollama":     "https://ollama.ai/download",
+}
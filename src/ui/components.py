@@ -0,0 +1,221 @@
+"""
+Interview Coach AI - HTML components
+Pure string builders for the Streamlit UI. They live outside app.py because
+Streamlit re-executes the script on every rerun; caches defined here persist
+for the life of the process.
+"""
+from __future__ import annotations
+from functools import lru_cache
+
+
+# Report bar colour per integer score 0-100: red <60, amber <80, green otherwise.
+REPORT_BAR_COLORS = tuple(
+    "#c0392b" if s < 60 else "#d4813a" if s < 80 else "#2d7a4f" for s in range(101)
+)
+
+
+@lru_cache(maxsize=256)
+def progress_html(total: int, current: int) -> str:
+    dots = []
+    for i in range(total):
+        cls = "prog-done" if i < current else ("prog-current" if i == current else "prog-dot")
+        dots.append(f'<div class="prog-dot {cls}"></div>')
+    return f'<div class="progress-strip">{"".join(dots)}</div>'
+
+
+@lru_cache(maxsize=256)
+def score_bar_html(label: str, val: int, max_val: int = 25) -> str:
+    pct = int(val / max_val * 100)
+    color = "#2d7a4f" if pct >= 80 else "#d4813a" if pct >= 50 else "#c0392b"
+    return f"""
+    <div class="star-row">
+      <span class="star-label">{label}</span>
+      <div class="star-track">
+        <div class="star-fill" style="width:{pct}%;background:{color}"></div>
+      </div>
+      <span class="star-val" style="color:{color}">{val}/{max_val}</span>
+    </div>"""
+
+
+@lru_cache(maxsize=256)
+def rpt_bar_html(label: str, score) -> str:
+    c = REPORT_BAR_COLORS[max(0, min(100, int(score)))]
+    return f"""
+    <div class="rpt-bar-wrap">
+      <div class="rpt-bar-label">
+        <span style="color:var(--ink-mid);font-weight:500">{label}</span>
+        <span style="color:{c};font-weight:700">{score}/100</span>
+      </div>
+      <div class="rpt-bar-track"><div class="rpt-bar-fill" style="width:{score}%;background:{c}"></div></div>
+    </div>"""
+
+# ── Page templates ────────────────────────────────────────────────
+# str.format templates for the larger per-page blocks. The renderers are
+# cached on their dynamic values, so an idle rerun reuses the built string.
+Q_CARD_TMPL = """
+    <div class="q-card">
+      <div class="q-number">Q{n}</div>
+      <div style="display:flex;align-items:center;gap:8px;margin-bottom:12px">
+        <span class="q-category">{cat}</span>
+        <span style="font-size:0.75rem;color:{diff_col};font-weight:600">{diff}</span>
+      </div>
+      <div class="q-text">"{text}"</div>
+    </div>"""
+
+GRADE_RING_TMPL = """
+    <div class="score-ring score-{grade}">
+      <div style="font-size:2rem">{score}</div>
+      <div style="font-size:1.2rem">Grade {grade}</div>
+    </div>"""
+
+TIP_TMPL = """
+    <div style="background:rgba(212,129,58,0.08);border:1px solid rgba(212,129,58,0.3);
+                border-radius:12px;padding:14px 16px;margin-bottom:12px">
+      <div style="font-size:0.75rem;font-weight:600;color:var(--amber);
+                  text-transform:uppercase;letter-spacing:0.06em;margin-bottom:6px">
+          💡 Alex's tip
+      </div>
+      <div style="font-size:0.9rem;color:var(--ink-mid);line-height:1.6">
+          {tip}
+      </div>
+    </div>"""
+
+PREVIEW_TMPL = """
+    <div style="background:var(--ink);border-radius:12px;padding:14px 16px;color:white">
+      <div style="font-size:0.72rem;color:rgba(255,255,255,0.5);
+                  text-transform:uppercase;letter-spacing:0.08em;margin-bottom:8px">
+          Session Preview
+      </div>
+      <div style="font-family:'Playfair Display',serif;font-size:1rem;
+                  font-weight:700;margin-bottom:4px">{field}</div>
+      <div style="font-size:0.82rem;color:rgba(255,255,255,0.65);margin-bottom:6px">
+          {exp_level}
+      </div>
+      <div style="font-size:0.8rem;color:rgba(255,255,255,0.5)">
+          Focus: {focus}
+      </div>
+      <div style="font-size:0.8rem;color:rgba(255,255,255,0.5);margin-top:4px">
+          10 tailored questions · Full STAR grading
+      </div>
+    </div>"""
+
+
+@lru_cache(maxsize=64)
+def q_card_html(n: int, cat: str, diff: str, diff_col: str, text: str) -> str:
+    return Q_CARD_TMPL.format(n=n, cat=cat, diff=diff, diff_col=diff_col, text=text)
+
+
+@lru_cache(maxsize=64)
+def grade_ring_html(score, grade: str) -> str:
+    return GRADE_RING_TMPL.format(score=score, grade=grade)
+
+
+@lru_cache(maxsize=64)
+def tip_html(tip: str) -> str:
+    return TIP_TMPL.format(tip=tip)
+
+
+@lru_cache(maxsize=128)
+def preview_html(field: str, exp_level: str, focus: tuple) -> str:
+    return PREVIEW_TMPL.format(field=field, exp_level=exp_level,
+                               focus=", ".join(focus) if focus else "All areas")
+
+
+HERO_TMPL = """
+    <div style="background:linear-gradient(135deg,{gc}18,{gc}06);border:2px solid {gc}40;
+                border-radius:20px;padding:28px;text-align:center;margin-bottom:24px">
+      <div style="font-size:4.5rem;font-weight:900;color:{gc};
+                  font-family:'Playfair Display',serif;line-height:1">{overall}</div>
+      <div style="font-size:2rem;font-weight:800;color:{gc}">Grade {grade}</div>
+      <div style="color:{gc};font-size:1rem;font-weight:600;margin-top:4px">{tier}</div>
+      <div style="color:var(--ink-mid);font-size:0.95rem;margin-top:10px;
+                  font-style:italic">"{headline}"</div>
+    </div>"""
+
+ACTION_ITEM_TMPL = """
+    <div style="display:flex;gap:12px;align-items:flex-start;margin-bottom:8px">
+      <div style="background:var(--teal);color:white;border-radius:50%;
+                  width:24px;height:24px;min-width:24px;display:flex;
+                  align-items:center;justify-content:center;font-size:0.75rem;
+                  font-weight:700">{n}</div>
+      <div style="color:var(--ink-mid);font-size:0.9rem;line-height:1.5">{item}</div>
+    </div>"""
+
+
+MODEL_ANSWER_TMPL = '<div class="fb-model"><b>Model Answer:</b> {text}</div>'
+
+
+@lru_cache(maxsize=32)
+def hero_html(overall, grade: str, tier: str, headline: str, gc: str) -> str:
+    return HERO_TMPL.format(overall=overall, grade=grade, tier=tier,
+                            headline=headline, gc=gc)
+
+
+@lru_cache(maxsize=32)
+def action_plan_html(items: tuple) -> str:
+    return "".join(ACTION_ITEM_TMPL.format(n=n, item=item)
+                   for n, item in enumerate(items, 1))
+
+
+STATUS_CARD_TMPL = """
+      <div class="card-cream" style="text-align:center;padding:12px;margin-bottom:0">
+        <div style="font-size:1.4rem">{icon}</div>
+        <div style="font-size:0.82rem;color:var(--ink-mid);margin-top:3px">{label}</div>
+      </div>"""
+
+
+@lru_cache(maxsize=64)
+def status_grid_html(cards: tuple) -> str:
+    """Setup-page readiness cards — ((ok, label), ...) — as one equal-width grid."""
+    body = "".join(STATUS_CARD_TMPL.format(icon="✅" if ok else "⭕", label=label)
+                   for ok, label in cards)
+    return (f'<div style="display:grid;grid-template-columns:repeat({len(cards)},1fr);'
+            f'gap:1rem;margin-bottom:1rem">{body}</div>')
+
+
+def report_txt(rpt: dict, data: list) -> bytes:
+    """Plain-text export of a finished report plus the Q-by-Q answers.
+    Lines are encoded as they are produced and joined as bytes, so the full
+    report never exists as one intermediate str."""
+    ap, note = rpt.get("action_plan", []), rpt.get("personal_note", "")
+    rule = "─".encode() * 50
+    lines = [
+        "INTERVIEW COACHING REPORT — Coach Alex AI".encode(),
+        b"=" * 50,
+        f"Overall Score: {rpt.get('overall_score', 0)}/100 · "
+        f"Grade {rpt.get('overall_grade', 'C')} · {rpt.get('tier', '')}".encode(),
+        f'"{rpt.get("headline", "")}"'.encode(), b"",
+    ]
+    for i, item in enumerate(data, 1):
+        g = item.get("grade", {})
+        lines.extend((f"\nQ{i}: {item.get('question','')}".encode(),
+                      f"Score: {g.get('score',0)}/100 ({g.get('grade','')})".encode(),
+                      f"Your Answer: {item.get('answer','')}".encode(),
+                      f"Coach: {g.get('coach_reaction','')}".encode(),
+                      f"Model Answer: {g.get('model_answer','')}".encode(), rule))
+    if ap:
+        lines.append(b"\nACTION PLAN:")
+        lines.extend(f"{i}. {a}".encode() for i, a in enumerate(ap, 1))
+    if note:
+        lines.extend((b"\nCOACH'S NOTE:", note.encode()))
+    return b"\n".join(lines)
+
+
+# Chat bubbles start at column 0 so markdown never reads their body as an
+# indented code block.
+COACH_BUBBLE_TMPL = ('<div class="bubble-coach">\n'
+                     '<div class="bubble-label label-coach">🎙️ {label}</div>\n'
+                     '{text}\n</div>')
+USER_BUBBLE_TMPL  = ('<div class="bubble-user">\n'
+                     '<div class="bubble-label label-user">You 👤</div>\n'
+                     '{text}\n</div>')
+
+
+@lru_cache(maxsize=128)
+def coach_bubble_html(text: str, label: str = "Coach Alex") -> str:
+    return COACH_BUBBLE_TMPL.format(text=text, label=label)
+
+
+@lru_cache(maxsize=128)
+def user_bubble_html(text: str) -> str:
+    return USER_BUBBLE_TMPL.format(text=text)
@@ -1,16 +1,19 @@
 """File parser - PDF, DOCX, TXT extraction."""
 from __future__ import annotations
-import io, re
+import re
 
 
 def extract_text(uploaded_file) -> tuple[str, str]:
-    """Returns (text, error). error is empty on success."""
+    """Returns (text, error). error is empty on success.
+    uploaded_file is a named binary stream (UploadedFile or BytesIO); PDF and
+    DOCX parsers read from it directly rather than from a copied bytes blob."""
     if uploaded_file is None:
         return "", "No file provided."
     name = uploaded_file.name.lower()
-    data = uploaded_file.read()
+    uploaded_file.seek(0)
     try:
         if name.endswith(".txt"):
+            data = uploaded_file.read()
             for enc in ["utf-8","latin-1","cp1252"]:
                 try: return data.decode(enc), ""
                 except: pass
@@ -18,7 +21,7 @@ def extract_text(uploaded_file) -> tuple[str, str]:
         elif name.endswith(".pdf"):
             try:
                 import pypdf
-                reader = pypdf.PdfReader(io.BytesIO(data))
+                reader = pypdf.PdfReader(uploaded_file)
                 text = "\n".join(p.extract_text() or "" for p in reader.pages).strip()
                 return (text, "") if text else ("", "PDF has no extractable text.")
             except ImportError:
@@ -26,7 +29,7 @@ def extract_text(uploaded_file) -> tuple[str, str]:
         elif name.endswith(".docx"):
             try:
                 import docx
-                doc = docx.Document(io.BytesIO(data))
+                doc = docx.Document(uploaded_file)
                 paras = [p.text for p in doc.paragraphs if p.text.strip()]
                 for tbl in doc.tables:
                     for row in tbl.rows:
@@ -42,7 +45,14 @@ def extract_text(uploaded_file) -> tuple[str, str]:
         return "", f"Parse error: {e}"
 
 
+# Blank-line runs and space/tab runs, matched in one scan. The two classes
+# are disjoint, so this is equivalent to applying them one after the other.
+_CLEAN_RE = re.compile(r"(\n{3,})|[ \t]{2,}")
+
+
+def _clean_sub(m: re.Match) -> str:
+    return "\n\n" if m.group(1) else " "
+
+
 def clean(text: str) -> str:
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    return text.strip()
+    return _CLEAN_RE.sub(_clean_sub, text).strip()